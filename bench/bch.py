@@ -0,0 +1,132 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"benchmark utilities"
+
+
+## import
+
+
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+from run.obj import Wd
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Result',
+            'compare',
+            'percentile',
+            'rate',
+            'read',
+            'timeit',
+            'workdir',
+            'write'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Result:
+
+    "a measurement, lower is better for ms, higher is better for everything else."
+
+    def __init__(self, name, value, unit):
+        self.name = name
+        self.value = value
+        self.unit = unit
+
+    def better(self):
+        return "lower" if self.unit == "ms" else "higher"
+
+
+## utility
+
+
+def compare(old, new, threshold=0.1):
+    "return (name, old, new, change) for every metric that got worse than threshold."
+    res = []
+    for nme, cur in new.items():
+        prv = old.get(nme)
+        if not prv or not prv["value"]:
+            continue
+        change = (cur["value"] - prv["value"]) / prv["value"]
+        if cur["unit"] != "ms":
+            change = -change
+        if change > threshold:
+            res.append((nme, prv["value"], cur["value"], change))
+    return res
+
+
+def percentile(values, pct):
+    "nearest rank percentile of an unsorted list of numbers."
+    if not values:
+        return 0.0
+    srt = sorted(values)
+    idx = max(0, math.ceil(pct / 100.0 * len(srt)) - 1)
+    return srt[idx]
+
+
+def rate(func, nr):
+    "call func nr times, return calls per second."
+    start = time.perf_counter()
+    for _nr in range(nr):
+        func()
+    return nr / (time.perf_counter() - start)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as ifile:
+        return json.load(ifile)["results"]
+
+
+def timeit(func, *args):
+    "milliseconds spent in func(*args)."
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def workdir(func, *args):
+    "run func with Wd.workdir pointing at a fresh temporary directory."
+    prv = Wd.workdir
+    tmp = tempfile.mkdtemp(prefix="runbench")
+    Wd.workdir = tmp
+    try:
+        return func(*args)
+    finally:
+        Wd.workdir = prv
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def write(path, results):
+    data = {
+            "time": time.time(),
+            "python": sys.version.split()[0],
+            "results": {
+                        x.name: {"value": x.value, "unit": x.unit}
+                        for x in results
+                       }
+           }
+    with open(path, "w", encoding="utf-8") as ofile:
+        json.dump(data, ofile, indent=4, sort_keys=True)
+    return path
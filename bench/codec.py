@@ -0,0 +1,51 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"dumps/loads benchmarks"
+
+
+## import
+
+
+import json
+
+
+import bch
+
+
+from run.obj import Default, Object, dumps, loads
+
+
+from bch import Result, rate
+
+
+## utility
+
+
+def nested(width, depth):
+    "an Object tree, width children per level, depth levels deep."
+    obj = Object()
+    obj.txt = "nested object at depth %s" % depth
+    obj.nr = depth
+    obj.opts = Default()
+    obj.opts.verbose = True
+    if depth:
+        obj.children = [nested(width, depth-1) for _nr in range(width)]
+    return obj
+
+
+## runtime
+
+
+def bench(nr, width=10, depth=2):
+    obj = nested(width, depth)
+    txt = dumps(obj)
+    size = len(txt) / 1024.0 / 1024.0
+    plain = json.loads(txt)
+    res = []
+    res.append(Result("dumps", rate(lambda: dumps(obj), nr) * size, "MB/s"))
+    res.append(Result("loads", rate(lambda: loads(txt), nr) * size, "MB/s"))
+    res.append(Result("json.dumps", rate(lambda: json.dumps(plain), nr) * size, "MB/s"))
+    res.append(Result("json.loads", rate(lambda: json.loads(txt), nr) * size, "MB/s"))
+    return res
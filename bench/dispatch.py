@@ -0,0 +1,100 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"dispatch benchmarks"
+
+
+## import
+
+
+import time
+
+
+import bch
+
+
+from run.bat import Batch
+from run.hdl import Command, Event, Handler, Msg
+
+
+from bch import Result, rate
+
+
+## class
+
+
+class Quiet(Handler):
+
+    def raw(self, txt):
+        pass
+
+
+## command
+
+
+def bnc(event):
+    event.reply("bench")
+
+
+## utility
+
+
+def batch(nr, jobs):
+    "batch mode lines per second, output in input order."
+    bat = Batch(jobs, lambda _txt: None)
+    bat.start()
+    start = time.perf_counter()
+    bat.run(["bnc"] * nr)
+    elapsed = time.perf_counter() - start
+    bat.stop()
+    return Result("batch.%s" % jobs, nr / elapsed, "lines/s")
+
+
+def pooled(nr):
+    "dispatch throughput with pooled Msg events, released after they are waited on."
+    hdl = Quiet()
+    hdl.start()
+    start = time.perf_counter()
+    for _nr in range(nr // 100):
+        events = []
+        for _nr2 in range(100):
+            msg = Msg.get("bnc")
+            msg.orig = repr(hdl)
+            hdl.put(msg)
+            events.append(msg)
+        for msg in events:
+            msg.wait()
+            msg.release()
+    elapsed = time.perf_counter() - start
+    hdl.stop()
+    return Result("dispatch.msg", (nr // 100) * 100 / elapsed, "events/s")
+
+
+## runtime
+
+
+def bench(nr):
+    Command.add(bnc)
+    hdl = Quiet()
+    hdl.start()
+    events = []
+    start = time.perf_counter()
+    for _nr in range(nr):
+        evt = Event()
+        evt.orig = repr(hdl)
+        evt.txt = "bnc"
+        hdl.put(evt)
+        events.append(evt)
+    for evt in events:
+        evt.wait()
+    elapsed = time.perf_counter() - start
+    hdl.stop()
+    return [
+            Result("dispatch", nr / elapsed, "events/s"),
+            pooled(nr),
+            batch(nr, 1),
+            batch(nr, 4),
+            Result("create.event", rate(Event, nr), "ops/s"),
+            Result("create.msg", rate(Msg, nr), "ops/s")
+           ]
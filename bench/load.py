@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"load generator"
+
+
+## import
+
+
+import argparse
+import importlib
+import json
+import random
+import sys
+import threading
+import time
+
+
+import bch
+
+
+from run import scan
+from run.hdl import Bus, Event, Handler
+
+
+from run import cmds, fnd
+
+
+from bch import percentile, workdir
+
+
+## class
+
+
+class Client(Handler):
+
+    def raw(self, txt):
+        pass
+
+
+class Timed(Event):
+
+    def __init__(self):
+        Event.__init__(self)
+        self.readytime = 0.0
+
+    def ready(self):
+        self.readytime = time.time()
+        Event.ready(self)
+
+
+class Sampler:
+
+    "samples the summed queue depth of the clients."
+
+    def __init__(self, clients, interval):
+        self.clients = clients
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def depth(self):
+        return sum([x.queue.qsize() for x in self.clients])
+
+    def run(self):
+        start = time.time()
+        while not self.stopped.wait(self.interval):
+            self.samples.append((round(time.time() - start, 3), self.depth()))
+
+    def start(self):
+        thr = threading.Thread(target=self.run, daemon=True)
+        thr.start()
+        return thr
+
+    def stop(self):
+        self.stopped.set()
+
+
+## utility
+
+
+def getclass(path):
+    "resolve a module:Class string to the Handler subclass to load."
+    modname, clsname = path.split(":")
+    return getattr(importlib.import_module(modname), clsname)
+
+
+def mix(spec):
+    "turn cmd:weight,... into a list to sample commands from."
+    res = []
+    for item in spec.split(","):
+        cmd, _sep, weight = item.partition(":")
+        res.extend([cmd] * int(weight or 1))
+    return res
+
+
+def generate(clients, commands, total, target):
+    "push total events round robin over the clients at target events/sec."
+    events = []
+    start = time.perf_counter()
+    for nr in range(total):
+        if target:
+            delay = start + nr / target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        clt = clients[nr % len(clients)]
+        evt = Timed()
+        evt.orig = repr(clt)
+        evt.channel = "#load"
+        evt.txt = random.choice(commands)
+        clt.put(evt)
+        events.append(evt)
+    return events
+
+
+def report(events, elapsed, samples):
+    latencies = [(x.readytime - x.createtime) * 1000.0 for x in events]
+    depths = [x[1] for x in samples] or [0]
+    return {
+            "events": len(events),
+            "elapsed": elapsed,
+            "throughput": len(events) / elapsed,
+            "latency": {
+                        "p50": percentile(latencies, 50),
+                        "p90": percentile(latencies, 90),
+                        "p99": percentile(latencies, 99),
+                        "max": max(latencies or [0.0])
+                       },
+            "depth": {
+                      "max": max(depths),
+                      "avg": sum(depths) / len(depths),
+                      "samples": samples
+                     }
+           }
+
+
+def loadtest(args):
+    clz = getclass(args.handler) if args.handler else Client
+    clients = []
+    for _nr in range(args.clients):
+        clt = clz()
+        clt.start()
+        clients.append(clt)
+    sampler = Sampler(clients, args.interval)
+    sampler.start()
+    start = time.perf_counter()
+    events = generate(clients, mix(args.mix), args.total, args.rate)
+    for evt in events:
+        evt.wait()
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+    for clt in clients:
+        clt.stop()
+        Bus.objs.remove(clt)
+    return report(events, elapsed, sampler.samples)
+
+
+## runtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="drive handlers with synthetic load")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0, help="events/sec, 0 is max")
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--mix", default="cmd:5,upt:3,fnd:1,log:1", help="cmd:weight,...")
+    parser.add_argument("--handler", help="module:Class of the handler to load")
+    parser.add_argument("--interval", type=float, default=0.1, help="depth sample secs")
+    parser.add_argument("--out", help="write the full report as json")
+    args = parser.parse_args()
+    scan(cmds)
+    scan(fnd)
+    res = workdir(loadtest, args)
+    lat = res["latency"]
+    print("%s events in %.2fs, %.1f events/s" % (res["events"], res["elapsed"], res["throughput"]))
+    print("latency ms p50 %.2f p90 %.2f p99 %.2f max %.2f" % (
+                                                              lat["p50"],
+                                                              lat["p90"],
+                                                              lat["p99"],
+                                                              lat["max"]
+                                                             ))
+    print("queue depth max %s avg %.1f" % (res["depth"]["max"], res["depth"]["avg"]))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as ofile:
+            json.dump(res, ofile, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
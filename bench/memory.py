@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"memory per loaded object, Object versus Record"
+
+
+## import
+
+
+import argparse
+import sys
+import tracemalloc
+
+
+import bch
+
+
+from run.obj import Class, Object, Record, find, save
+
+
+from bch import workdir
+
+
+## class
+
+
+class Plain(Object):
+
+    def __init__(self):
+        Object.__init__(self)
+        self.txt = ""
+        self.nick = ""
+        self.channel = ""
+
+
+class Slotted(Record):
+
+    __slots__ = ("txt", "nick", "channel")
+
+
+Class.add(Plain)
+Class.add(Slotted)
+
+
+## utility
+
+
+def measure(otype, size):
+    for nr in range(size):
+        obj = otype()
+        obj.txt = "memory benchmark line %s" % nr
+        obj.nick = "bart"
+        obj.channel = "#runlib"
+        save(obj)
+    tracemalloc.start()
+    res = find(otype.__name__.lower())
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(res), used
+
+
+## runtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare Object and Record memory")
+    parser.add_argument("--size", type=int, default=5000)
+    args = parser.parse_args()
+    for otype in (Plain, Slotted):
+        nr, used = workdir(measure, otype, args.size)
+        print("%-8s %8s objects %10s bytes %6.0f bytes/object" % (
+                                                                  otype.__name__,
+                                                                  nr,
+                                                                  used,
+                                                                  used / nr
+                                                                 ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
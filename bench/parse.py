@@ -0,0 +1,40 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"parse benchmarks"
+
+
+## import
+
+
+import bch
+
+
+from run.hdl import Parsed
+
+
+from bch import Result, rate
+
+
+## define
+
+
+TEXTS = (
+         "cmd",
+         "log this is a somewhat longer log line",
+         "fnd log txt==test -v",
+         "cfg server=localhost port=6667 nick=bot",
+        )
+
+
+## runtime
+
+
+def bench(nr):
+    res = []
+    for txt in TEXTS:
+        def doparse():
+            Parsed().parse(txt)
+        res.append(Result("parse.%s" % txt.split()[0], rate(doparse, nr), "ops/s"))
+    return res
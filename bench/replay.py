@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"replay a recorded event log"
+
+
+## import
+
+
+import argparse
+import json
+import sys
+import time
+
+
+import bch
+
+
+from run import scan
+from run.rec import replay
+
+
+from run import cmds, fnd
+
+
+from bch import workdir
+from load import Client, Timed, report
+
+
+## utility
+
+
+def run(args):
+    hdl = Client()
+    hdl.start()
+    start = time.perf_counter()
+    events = replay(hdl, args.path, args.speed, Timed)
+    for evt in events:
+        evt.wait()
+    elapsed = time.perf_counter() - start
+    hdl.stop()
+    return report(events, elapsed, [])
+
+
+## runtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay a recorded event log")
+    parser.add_argument("path", help="log written by run -r")
+    parser.add_argument("--speed", type=float, default=1.0, help="0 is max speed")
+    parser.add_argument("--out", help="write the report as json")
+    args = parser.parse_args()
+    scan(cmds)
+    scan(fnd)
+    res = workdir(run, args)
+    lat = res["latency"]
+    print("%s events in %.2fs, %.1f events/s" % (res["events"], res["elapsed"], res["throughput"]))
+    print("latency ms p50 %.2f p90 %.2f p99 %.2f max %.2f" % (
+                                                              lat["p50"],
+                                                              lat["p90"],
+                                                              lat["p99"],
+                                                              lat["max"]
+                                                             ))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as ofile:
+            json.dump(res, ofile, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"startup budget"
+
+
+## import
+
+
+import argparse
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+## define
+
+
+MODULES = "import run, run.cmds, run.cpt, run.dmn, run.err, run.exp, run.fnd, run.mre, run.slw"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+ENV = dict(os.environ)
+ENV.pop("PYTHONDONTWRITEBYTECODE", None)
+
+
+## utility
+
+
+def importtime(stmt=MODULES):
+    "cumulative import time, in milliseconds, of the top level run modules."
+    proc = subprocess.run(
+                          [sys.executable, "-X", "importtime", "-c", stmt],
+                          cwd=ROOT,
+                          env=ENV,
+                          capture_output=True,
+                          text=True,
+                          check=True
+                         )
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, modname = line[12:].split("|")
+        if modname.startswith(" run"):
+            total += int(cumulative)
+    return total / 1000.0
+
+
+def firstoutput(cmd="cmd", env=None):
+    "wall clock milliseconds from spawning bin/run until its first output line."
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+                            [sys.executable, os.path.join("bin", "run"), cmd],
+                            cwd=ROOT,
+                            env=env or ENV,
+                            stdout=subprocess.PIPE,
+                            text=True
+                           )
+    proc.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000.0
+    proc.communicate()
+    return elapsed
+
+
+def daemonized(rounds):
+    "firstoutput() with bin/run handing the command to a daemon in a scratch HOME."
+    home = tempfile.mkdtemp(prefix="runbench")
+    env = dict(ENV, HOME=home)
+    wdr = os.path.join(home, ".run")
+    subprocess.run([sys.executable, os.path.join("bin", "run"), "-d"], cwd=ROOT, env=env, check=True)
+    try:
+        for _nr in range(100):
+            if os.path.exists(os.path.join(wdr, "run.sock")):
+                break
+            time.sleep(0.05)
+        return measure(lambda: firstoutput(env=env), rounds)
+    finally:
+        with open(os.path.join(wdr, "run.pid"), "r", encoding="utf-8") as ifile:
+            os.kill(int(ifile.read()), signal.SIGTERM)
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def measure(func, rounds):
+    "median of rounds calls, after one warm up call that writes the bytecode caches."
+    func()
+    return statistics.median([func() for _nr in range(rounds)])
+
+
+## runtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fail when startup regresses")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=30.0, help="ms")
+    parser.add_argument("--startup-budget", type=float, default=100.0, help="ms")
+    parser.add_argument("--daemon", action="store_true", help="also time the daemon client")
+    args = parser.parse_args()
+    imp = measure(importtime, args.rounds)
+    fst = measure(firstoutput, args.rounds)
+    print("import %.1fms (budget %.1fms)" % (imp, args.import_budget))
+    print("first output %.1fms (budget %.1fms)" % (fst, args.startup_budget))
+    if args.daemon:
+        print("first output through the daemon %.1fms" % daemonized(args.rounds))
+    failed = False
+    if imp > args.import_budget:
+        print("FAIL import time over budget")
+        failed = True
+    if fst > args.startup_budget:
+        print("FAIL time to first output over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"store benchmarks"
+
+
+## import
+
+
+import bch
+
+
+from run.cmds import Log
+from run.obj import find, fns, hook, save
+
+
+from bch import Result, rate, timeit, workdir
+
+
+## utility
+
+
+def build(size, otype=Log):
+    "fill the store with size objects of otype, return their paths."
+    paths = []
+    for nr in range(size):
+        obj = otype()
+        obj.txt = "synthetic log entry number %s" % nr
+        paths.append(save(obj))
+    return paths
+
+
+def saveload(nr):
+    res = []
+    objs = []
+    def dosave():
+        obj = Log()
+        obj.txt = "save benchmark"
+        objs.append(save(obj))
+    res.append(Result("save", rate(dosave, nr), "ops/s"))
+    paths = iter(fns("run.cmds.Log"))
+    res.append(Result("load", rate(lambda: hook(next(paths)), nr), "ops/s"))
+    return res
+
+
+def query(size):
+    build(size)
+    res = [Result("find.%s" % size, timeit(find, "log"), "ms")]
+    res.append(Result("find.select.%s" % size, timeit(find, "log", {"txt": "number 1"}), "ms"))
+    return res
+
+
+def wide(size, blob=64*1024):
+    "full decode against a txt only projection of objects carrying a large blob."
+    for nr in range(size):
+        obj = Log()
+        obj.blob = "b" * blob
+        obj.txt = "wide log entry number %s" % nr
+        save(obj)
+    res = [Result("find.wide.%s" % size, timeit(find, "log"), "ms")]
+    res.append(Result("find.project.%s" % size, timeit(find, "log", None, None, None, False, None, ["txt"]), "ms"))
+    return res
+
+
+## runtime
+
+
+def bench(sizes, nr):
+    res = workdir(saveload, nr)
+    for size in sizes:
+        res.extend(workdir(query, size))
+        res.extend(workdir(wide, size))
+    return res
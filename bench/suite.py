@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# This file is placed in the Public Domain.
+# pylint: disable=C0114,C0115,C0116
+
+
+"benchmark suite"
+
+
+## import
+
+
+import argparse
+import sys
+
+
+import bch
+import codec
+import dispatch
+import parse
+import store
+
+
+## runtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run the benchmark suite")
+    parser.add_argument("--sizes", default="100,1000", help="store sizes")
+    parser.add_argument("--nr", type=int, default=1000, help="operations per rate")
+    parser.add_argument("--out", default="bench.json", help="json results")
+    parser.add_argument("--baseline", help="earlier json results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",") if x]
+    results = []
+    results.extend(store.bench(sizes, args.nr))
+    results.extend(parse.bench(args.nr))
+    results.extend(dispatch.bench(args.nr))
+    results.extend(codec.bench(max(1, args.nr // 10)))
+    for res in results:
+        print("%-24s %12.2f %s" % (res.name, res.value, res.unit))
+    bch.write(args.out, results)
+    if not args.baseline:
+        return 0
+    regressions = bch.compare(bch.read(args.baseline), bch.read(args.out), args.threshold)
+    for nme, old, new, change in regressions:
+        print("REGRESSION %s %.2f -> %.2f (%+.0f%%)" % (nme, old, new, change*100))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
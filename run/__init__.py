@@ -12,15 +12,15 @@
 ## import
 
 
-import inspect
 import os
 import sys
-import traceback
+import types
 
 
-from .obj import Class, Default, Wd, name
+from .obj import Class, Default, Wd
 from .hdl import Command, Event
 from .thr import launch
+from .utl import from_exception
 
 
 def __dir__():
@@ -53,16 +53,6 @@ def command(cli, txt, event=None):
     return evt
 
 
-def from_exception(exc, txt="", sep=" "):
-    result = []
-    for frm in traceback.extract_tb(exc.__traceback__):
-        fnm = os.sep.join(frm.filename.split(os.sep)[-2:])
-        result.append(f"{fnm}:{frm.lineno}")
-    nme = name(exc)
-    res = sep.join(result)
-    return f"{txt} {res} {nme}: {exc}"
-
-
 def savepid(name=None):
     if not name:
         name = sys.argv[0]
@@ -73,7 +63,9 @@ def savepid(name=None):
 
 def scan(mod):
     scancls(mod)
-    for key, cmd in inspect.getmembers(mod, inspect.isfunction):
+    for key, cmd in sorted(vars(mod).items()):
+        if not isinstance(cmd, types.FunctionType):
+            continue
         if key.startswith("cb"):
             continue
         names = cmd.__code__.co_varnames
@@ -82,8 +74,9 @@ def scan(mod):
 
 
 def scancls(mod):
-    for _k, clz in inspect.getmembers(mod, inspect.isclass):
-        Class.add(clz)
+    for _k, clz in sorted(vars(mod).items()):
+        if isinstance(clz, type):
+            Class.add(clz)
 
 
 def scandir(path, func):
@@ -0,0 +1,96 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"aggregation"
+
+
+## import
+
+
+import json
+
+
+from .obj import Class, Wd, fns, fntime, items, selected
+
+
+## define
+
+
+def __dir__():
+    return (
+            'FUNCS',
+            'aggregate'
+           )
+
+
+__all__ = __dir__()
+
+
+FUNCS = ("count", "first", "last", "max", "min")
+
+
+## utility
+
+
+def number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def records(otp, selector=None, timed=None, deleted=False):
+    "yield (time, dict) per stored object, oldest first, without building objects."
+    names = Class.full(otp)
+    if not names:
+        names = Wd.types(otp)
+    selector = dict(items(selector or {}))
+    paths = []
+    for nme in names:
+        paths.extend(fns(nme, timed))
+    for path in sorted(paths, key=fntime):
+        with open(path, "r", encoding="utf-8") as ifile:
+            data = json.load(ifile)
+        if deleted and data.get("__deleted__"):
+            continue
+        if selector and not selected(data, selector):
+            continue
+        yield fntime(path), data
+
+
+def aggregate(otp, func="count", field=None, by=None, selector=None, timed=None, deleted=False):
+    """stream over the store and return {group: value}, group is "" without by.
+
+       count       number of objects
+       min/max     smallest/largest value of field, or of the save time
+       first/last  field (or the whole record) of the oldest/newest object
+
+    """
+    if func not in FUNCS:
+        raise ValueError("%s is not one of %s" % (func, ",".join(FUNCS)))
+    res = {}
+    for tme, data in records(otp, selector, timed, deleted):
+        grp = str(data.get(by, "")) if by else ""
+        if func == "count":
+            res[grp] = res.get(grp, 0) + 1
+            continue
+        if func in ("first", "last"):
+            if func == "last" or grp not in res:
+                res[grp] = data.get(field, "") if field else data
+            continue
+        if field:
+            if field not in data:
+                continue
+            val = number(data[field])
+        else:
+            val = tme
+        if grp not in res:
+            res[grp] = val
+            continue
+        prv, cur = res[grp], val
+        if type(prv) != type(cur):
+            prv, cur = str(prv), str(cur)
+        if (cur < prv) if func == "min" else (cur > prv):
+            res[grp] = val
+    return res
@@ -0,0 +1,98 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"batch"
+
+
+## import
+
+
+import collections
+import time
+
+
+from .hdl import Event, Handler
+from .thr import launch
+from .utl import elapsed
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Batch',
+            'Line'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Line(Event):
+
+    "the Event a batch line runs as, ok() becomes a reply so it keeps its place."
+
+    def ok(self):
+        self.reply('ok %s' % elapsed(time.time()-self.createtime))
+
+
+class Batch(Handler):
+
+    """Runs command lines with jobs loops on one queue. Replies are held on
+       the events and written in input order, at most window events are
+       in flight so long inputs stream through in constant memory. With
+       jobs above 1 commands run concurrently, a line may not see what an
+       earlier line saved.
+    """
+
+    def __init__(self, jobs=1, out=print, window=0):
+        Handler.__init__(self)
+        self.jobs = max(1, jobs)
+        self.out = out
+        self.window = window or self.jobs * 4
+
+    def emit(self, evt):
+        evt.wait()
+        for txt in evt.result:
+            self.out(txt)
+        if evt._exc:
+            from . import from_exception
+            self.out(from_exception(evt._exc))
+
+    def run(self, lines):
+        "dispatch every non empty, non comment line, returns the number of commands."
+        nr = 0
+        pending = collections.deque()
+        for line in lines:
+            txt = line.strip()
+            if not txt or txt.startswith("#"):
+                continue
+            evt = Line()
+            evt.orig = repr(self)
+            evt.txt = txt
+            self.put(evt)
+            pending.append(evt)
+            nr += 1
+            while len(pending) >= self.window:
+                self.emit(pending.popleft())
+        while pending:
+            self.emit(pending.popleft())
+        return nr
+
+    def say(self, channel, txt):
+        pass
+
+    def start(self):
+        self.stopped.clear()
+        for _nr in range(self.jobs):
+            launch(self.loop, name="batch")
+
+    def stop(self):
+        self.stopped.set()
+        for _nr in range(self.jobs):
+            self.queue.put_nowait(None)
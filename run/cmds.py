@@ -11,7 +11,8 @@ import time
 
 
 from .hdl import Command
-from .obj import Class, Object, find, fntime, save, update
+from .mre import Cursor
+from .obj import Class, Object, fntime, save, stream, update
 from .utl import elapsed
 
 
@@ -41,6 +42,18 @@ class Todo(Log):
 Class.add(Todo)
 
 
+## utility
+
+
+def listed(objs):
+    for nmr, obj in enumerate(objs):
+        yield "%s %s %s" % (
+                            nmr,
+                            obj.txt,
+                            elapsed(time.time() - fntime(obj.__fnm__))
+                           )
+
+
 ## command
 
 
@@ -50,14 +63,7 @@ def cmd(event):
 
 def log(event):
     if not event.rest:
-        nmr = 0
-        for obj in find("log"):
-            event.reply("%s %s %s" % (
-                                      nmr,
-                                      obj.txt,
-                                      elapsed(time.time() - fntime(obj.__fnm__)))
-                                     )
-            nmr += 1
+        Cursor.page(event, listed(stream("log", keyz=["txt"])), ("log", None))
         return
     obj = Log()
     obj.txt = event.rest
@@ -67,14 +73,7 @@ def log(event):
 
 def tdo(event):
     if not event.rest:
-        nmr = 0
-        for obj in find("todo"):
-            event.reply("%s %s %s" % (
-                                      nmr,
-                                      obj.txt,
-                                      elapsed(time.time() - fntime(obj.__fnm__))
-                                     ))
-            nmr += 1
+        Cursor.page(event, listed(stream("todo", keyz=["txt"])), ("todo", None))
         return
     obj = Todo()
     obj.txt = event.rest
@@ -0,0 +1,136 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"compaction"
+
+
+## import
+
+
+import json
+import os
+import time
+
+
+from .obj import Class, Digest, Wd, cdir, fntime
+from .utl import Flock
+
+
+## define
+
+
+def __dir__():
+    return (
+            'compact',
+            'cpt',
+            'prune',
+            'versions'
+           )
+
+
+__all__ = __dir__()
+
+
+## utility
+
+
+def archive(otp, paths):
+    "append superseded versions to Wd.workdir/archive/<type>.jsonl."
+    apath = os.path.join(Wd.get(), "archive", "%s.jsonl" % otp)
+    cdir(apath)
+    with open(apath, "a", encoding="utf-8") as ofile:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as ifile:
+                data = json.load(ifile)
+            fnm = os.sep.join(path.split(os.sep)[-4:])
+            ofile.write(json.dumps({"fnm": fnm, "data": data}, sort_keys=True) + "\n")
+    return apath
+
+
+def compact(otp=None, keep=1, days=0, keeparchive=True):
+    """remove versions that queries no longer read, the newest keep versions
+       of an object and versions younger than days are retained.
+    """
+    keep = max(1, keep)
+    limit = time.time() - days * 24 * 60 * 60 if days else None
+    removed = 0
+    for typ in resolve(otp):
+        lpath = os.path.join(Wd.get(), "archive", "%s.lock" % typ)
+        cdir(lpath)
+        with Flock(lpath):
+            removed += compacttype(typ, keep, limit, keeparchive)
+    if removed:
+        prune()
+    return removed
+
+
+def compacttype(otp, keep, limit, keeparchive):
+    stale = []
+    tdir = os.path.join(Wd.storedir(), otp)
+    for uid in os.listdir(tdir):
+        old = versions(os.path.join(tdir, uid))[:-keep]
+        if limit:
+            old = [x for x in old if fntime(x) < limit]
+        stale.extend(old)
+    if stale and keeparchive:
+        archive(otp, stale)
+    for path in stale:
+        os.remove(path)
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+    return len(stale)
+
+
+def prune():
+    "remove content addressed payloads no stored version links to anymore."
+    nr = 0
+    cdr = Digest.casdir()
+    if not os.path.exists(cdr):
+        return nr
+    for rootdir, _dirs, files in os.walk(cdr):
+        for fnm in files:
+            path = os.path.join(rootdir, fnm)
+            if os.stat(path).st_nlink == 1:
+                os.remove(path)
+                nr += 1
+    return nr
+
+
+def resolve(otp=None):
+    "the stored types otp names, exact matches only when there are any."
+    stored = Wd.types()
+    if not otp:
+        return stored
+    names = [x for x in Class.full(otp) if x in stored]
+    if names:
+        return names
+    names = Wd.types(otp)
+    exact = [x for x in names if x.split(".")[-1].lower() == otp.lower()]
+    return exact or names
+
+
+def versions(udir):
+    "all version files of one object, oldest first."
+    res = []
+    for day in sorted(os.listdir(udir)):
+        ddir = os.path.join(udir, day)
+        res.extend([os.path.join(ddir, x) for x in sorted(os.listdir(ddir))])
+    return res
+
+
+## command
+
+
+def cpt(event):
+    keep = int(event.sets.keep or 1)
+    days = float(event.sets.days or 0)
+    nr = compact(
+                 event.args and event.args[0] or None,
+                 keep,
+                 days,
+                 "d" not in event.opts
+                )
+    event.reply("%s versions compacted" % nr)
@@ -0,0 +1,137 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"daemon"
+
+
+## import
+
+
+import os
+import socket
+import threading
+
+
+from .hdl import Bus, Handler
+from .obj import Wd, cdir
+from .thr import launch
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Daemon',
+            'Session'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Session(Handler):
+
+    "one client connection, reply lines are written to the socket as they are shown."
+
+    def __init__(self, conn):
+        Handler.__init__(self)
+        self.conn = conn
+
+    def raw(self, txt):
+        try:
+            self.conn.sendall((txt + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+
+class Daemon:
+
+    """Serves commands on Wd.workdir/run.sock. A client writes one command
+       line and closes its write side, the reply lines stream back until
+       the daemon closes the connection.
+    """
+
+    sock = None
+    stopped = threading.Event()
+
+    @staticmethod
+    def alive():
+        "True when a daemon answers on the socket."
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(Daemon.path())
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    def path():
+        return os.path.join(Wd.get(), "run.sock")
+
+    @staticmethod
+    def serve():
+        "accept connections until stop(), every session runs in its own thread."
+        while not Daemon.stopped.is_set():
+            try:
+                conn, _addr = Daemon.sock.accept()
+            except OSError:
+                break
+            launch(Daemon.session, conn, name="session")
+
+    @staticmethod
+    def session(conn):
+        from . import command, from_exception
+        sess = Session(conn)
+        try:
+            with conn.makefile("r", encoding="utf-8") as ifile:
+                txt = ifile.readline().strip()
+            if txt:
+                evt = command(sess, txt)
+                evt.wait()
+                if evt._exc:
+                    sess.raw(from_exception(evt._exc))
+        except Exception as ex:
+            sess.raw(from_exception(ex))
+        finally:
+            Bus.remove(sess)
+            conn.close()
+
+    @staticmethod
+    def start():
+        """bind the socket, owner only from the start, a stale one left by a
+           dead daemon gets replaced.
+        """
+        path = Daemon.path()
+        if Daemon.alive():
+            raise RuntimeError("a daemon is already listening on %s" % path)
+        cdir(path)
+        if os.path.exists(path):
+            os.remove(path)
+        Daemon.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            Daemon.sock.bind(path)
+        finally:
+            os.umask(umask)
+        Daemon.sock.listen(64)
+        Daemon.stopped.clear()
+
+    @staticmethod
+    def stop():
+        Daemon.stopped.set()
+        if Daemon.sock:
+            try:
+                Daemon.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            Daemon.sock.close()
+            Daemon.sock = None
+        try:
+            os.remove(Daemon.path())
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,107 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"errors"
+
+
+## import
+
+
+import collections
+import threading
+import time
+
+
+from .utl import elapsed, from_exception, site
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Errors',
+            'err'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Errors:
+
+    """Bounded store of the exceptions callbacks and commands raised. Only
+       the formatted text is kept, not the exception, so no traceback
+       frames stay alive. ring holds the max most recent ones, sites
+       counts them per raising line and forgets the least recently seen
+       site when there are more than max.
+    """
+
+    lock = threading.Lock()
+    max = 100
+    ring = collections.deque(maxlen=max)
+    sites = {}
+
+    @staticmethod
+    def add(exc):
+        "record exc, returns its formatted text."
+        txt = from_exception(exc)
+        key = site(exc)
+        now = time.time()
+        with Errors.lock:
+            if Errors.ring.maxlen != Errors.max:
+                Errors.ring = collections.deque(Errors.ring, maxlen=Errors.max)
+            Errors.ring.append((now, key, txt))
+            count, first, _last, _txt = Errors.sites.pop(key, (0, now, now, txt))
+            Errors.sites[key] = (count + 1, first, now, txt)
+            while len(Errors.sites) > Errors.max:
+                Errors.sites.pop(next(iter(Errors.sites)))
+        return txt
+
+    @staticmethod
+    def clear():
+        with Errors.lock:
+            Errors.ring.clear()
+            Errors.sites.clear()
+
+    @staticmethod
+    def recent(nr=10):
+        "(time, site, text) of the nr most recent errors, newest first."
+        with Errors.lock:
+            res = list(Errors.ring)
+        return list(reversed(res))[:nr]
+
+    @staticmethod
+    def summary():
+        "(site, count, first, last, text) per site, most recently seen first."
+        with Errors.lock:
+            res = [(key,) + value for key, value in Errors.sites.items()]
+        return list(reversed(res))
+
+
+## command
+
+
+def err(event):
+    if "c" in event.opts:
+        Errors.clear()
+        event.reply("errors cleared")
+        return
+    top = int(event.sets.top or 10)
+    if event.args and event.args[0] == "recent":
+        res = Errors.recent(top)
+        if not res:
+            event.reply("no errors")
+        for stamp, _key, txt in res:
+            event.reply("%s ago%s" % (elapsed(time.time() - stamp), txt))
+        return
+    res = Errors.summary()
+    if not res:
+        event.reply("no errors")
+        return
+    for key, count, _first, last, txt in res[:top]:
+        event.reply("%sx %s ago%s" % (count, elapsed(time.time() - last), txt))
@@ -0,0 +1,173 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"columnar export"
+
+
+## import
+
+
+import array
+import json
+import os
+
+
+from .obj import Class, Wd, cdir, fns, fntime
+from .utl import Flock
+
+
+## define
+
+
+def __dir__():
+    return (
+            'columns',
+            'exp',
+            'export'
+           )
+
+
+__all__ = __dir__()
+
+
+## utility
+
+
+def column(values):
+    "'d' for columns that are all numbers, 's' for everything else."
+    for val in values:
+        if isinstance(val, bool) or not isinstance(val, (int, float)):
+            return "s"
+    return "d"
+
+
+def edir(otp):
+    return os.path.join(Wd.get(), "export", otp)
+
+
+def readmeta(otp):
+    path = os.path.join(edir(otp), "meta.json")
+    if not os.path.exists(path):
+        return {"columns": {}, "last": 0.0, "rows": 0}
+    with open(path, "r", encoding="utf-8") as ifile:
+        return json.load(ifile)
+
+
+def writemeta(otp, meta):
+    path = os.path.join(edir(otp), "meta.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as ofile:
+        json.dump(meta, ofile, indent=4, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def append(otp, key, typ, values):
+    path = os.path.join(edir(otp), key)
+    if typ == "d":
+        with open(path, "ab") as ofile:
+            array.array("d", [float(x) for x in values]).tofile(ofile)
+        return
+    with open(path, "a", encoding="utf-8") as ofile:
+        for val in values:
+            ofile.write(json.dumps(val if isinstance(val, str) else str(val)) + "\n")
+
+
+def export(otp, incremental=True, batch=10000):
+    """write every stored object of type otp as columns to Wd.workdir/export/otp,
+       one file per field (array('d') for numbers, json lines otherwise)
+       next to a meta.json. incremental exports append only objects saved
+       after the previous export. returns the number of rows written.
+    """
+    cdir(os.path.join(edir(otp), ""))
+    with Flock(edir(otp) + ".lock"):
+        return exporting(otp, incremental, batch)
+
+
+def exporting(otp, incremental, batch):
+    meta = readmeta(otp) if incremental else {"columns": {}, "last": 0.0, "rows": 0}
+    if not incremental:
+        for fnm in os.listdir(edir(otp)):
+            os.remove(os.path.join(edir(otp), fnm))
+    paths = fns(otp, {"from": meta["last"]} if meta["last"] else None)
+    paths = [x for x in paths if fntime(x) > meta["last"]]
+    for nr in range(0, len(paths), batch):
+        rows = []
+        for path in paths[nr:nr+batch]:
+            with open(path, "r", encoding="utf-8") as ifile:
+                data = json.load(ifile)
+            data["__fnm__"] = os.sep.join(path.split(os.sep)[-4:])
+            data["__time__"] = fntime(path)
+            rows.append(data)
+        flush(otp, meta, rows)
+        meta["last"] = rows[-1]["__time__"]
+        meta["rows"] += len(rows)
+        writemeta(otp, meta)
+    if not meta["rows"]:
+        writemeta(otp, meta)
+    return len(paths)
+
+
+def flush(otp, meta, rows):
+    cols = meta["columns"]
+    keyz = sorted(set().union(*[x.keys() for x in rows]))
+    for key in keyz:
+        if key in cols:
+            continue
+        typ = column([x[key] for x in rows if key in x])
+        cols[key] = typ
+        if meta["rows"]:
+            append(otp, key, typ, [float("nan") if typ == "d" else ""] * meta["rows"])
+    for key, typ in cols.items():
+        values = []
+        for row in rows:
+            val = row.get(key, float("nan") if typ == "d" else "")
+            if typ == "d" and (isinstance(val, bool) or not isinstance(val, (int, float))):
+                val = float("nan")
+            values.append(val)
+        append(otp, key, typ, values)
+
+
+def columns(otp, keyz=None, numpy=False):
+    "read an export back as {field: array/list}, numpy arrays when asked and installed."
+    meta = readmeta(otp)
+    res = {}
+    for key, typ in meta["columns"].items():
+        if keyz and key not in keyz:
+            continue
+        path = os.path.join(edir(otp), key)
+        if typ == "d":
+            col = array.array("d")
+            with open(path, "rb") as ifile:
+                col.frombytes(ifile.read())
+        else:
+            with open(path, "r", encoding="utf-8") as ifile:
+                col = [json.loads(x) for x in ifile]
+        res[key] = col
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError:
+            return res
+        for key, col in res.items():
+            if isinstance(col, array.array):
+                res[key] = np.frombuffer(col, dtype="d")
+            else:
+                res[key] = np.array(col, dtype=object)
+    return res
+
+
+## command
+
+
+def exp(event):
+    if not event.args:
+        event.reply("exp <type> [-f]")
+        return
+    names = Class.full(event.args[0]) or Wd.types(event.args[0])
+    if not names:
+        event.reply("no %s type found" % event.args[0])
+        return
+    for otp in names:
+        nr = export(otp, "f" not in event.opts)
+        event.reply("%s %s rows exported to %s" % (otp, nr, edir(otp)))
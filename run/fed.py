@@ -0,0 +1,101 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"change feed"
+
+
+## import
+
+
+import threading
+
+
+from .hdl import Event
+from .obj import Watch, kind, payload, selected
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Feed',
+            'Saved'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Saved(Event):
+
+    "event put on a subscriber's queue when a matching object got saved."
+
+    def __init__(self):
+        Event.__init__(self)
+        self.func = None
+        self.obj = None
+        self.path = ""
+        self.type = "save"
+
+
+class Feed:
+
+    """Subscriptions on save(), matching saves are queued on the subscribing
+       Handler as Saved events, no polling of the store needed. evt.obj is
+       the saved object itself, evt.path the read-only version on disk.
+    """
+
+    lock = threading.Lock()
+    subs = []
+
+    @staticmethod
+    def deliver(evt):
+        try:
+            evt.func(evt)
+        finally:
+            evt.ready()
+
+    @staticmethod
+    def matches(sub, obj):
+        _hdl, _func, otp, selector = sub
+        if otp and otp != kind(obj).split(".")[-1].lower():
+            return False
+        if selector and not selected(payload(obj), selector):
+            return False
+        return True
+
+    @staticmethod
+    def publish(obj, path):
+        for sub in list(Feed.subs):
+            if not Feed.matches(sub, obj):
+                continue
+            hdl, func, _otp, _selector = sub
+            evt = Saved()
+            evt.func = func
+            evt.obj = obj
+            evt.orig = repr(hdl)
+            evt.path = path
+            hdl.put(evt)
+
+    @staticmethod
+    def subscribe(hdl, func, otp=None, selector=None):
+        "call func(evt) from hdl's loop for every saved otp matching selector."
+        sub = (hdl, func, otp and otp.lower(), dict(selector or {}))
+        hdl.register("save", Feed.deliver)
+        with Feed.lock:
+            Feed.subs.append(sub)
+            Watch.add(Feed.publish)
+        return sub
+
+    @staticmethod
+    def unsubscribe(sub):
+        with Feed.lock:
+            if sub in Feed.subs:
+                Feed.subs.remove(sub)
+            if not Feed.subs:
+                Watch.remove(Feed.publish)
@@ -11,12 +11,40 @@
 import time
 
 
-from .obj import Wd, find, fntime, keys, printable
+from .agg import FUNCS, aggregate
+from .mre import Cursor
+from .obj import Object, Wd, fntime, keys, printable, stream
+from .prl import pfind
 from .utl import elapsed
 
 
+## utility
+
+
+def aggregated(evt):
+    otype, func, *fields = evt.args
+    res = aggregate(
+                    otype,
+                    func,
+                    fields and fields[0] or None,
+                    evt.sets.by or None,
+                    evt.gets,
+                    evt.sets
+                   )
+    if not res:
+        evt.reply("no result (%s)" % evt.txt)
+        return
+    for grp, value in sorted(res.items()):
+        if isinstance(value, dict):
+            value = printable(Object(value), evt.sets.keys)
+        elif func in ("min", "max") and not fields:
+            value = elapsed(time.time()-value)
+        evt.reply("%s %s" % (grp or func, value))
+
+
 ## command
 
+
 def fnd(event):
     if not event.args:
         res = ",".join(sorted([x.split(".")[-1].lower() for x in Wd.types()]))
@@ -26,14 +54,25 @@ def fnd(event):
             event.reply("no types yet.")
         return
     otype = event.args[0]
-    nmr = 0
-    for obj in find(otype, event.gets):
-        txt = "%s %s %s" % (
-                            str(nmr),
-                            printable(obj, event.sets.keys or keys(obj), event.toskip),
-                            elapsed(time.time()-fntime(obj.__fnm__))
-                           )
-        nmr += 1
-        event.reply(txt)
-    if not nmr:
+    if len(event.args) > 1 and event.args[1] in FUNCS:
+        aggregated(event)
+        return
+    limit = int(event.sets.limit or 0) or None
+    keyz = event.args[1:] or [x for x in (event.sets.keys or "").split(",") if x]
+    query = None
+    if Cursor.size and not limit:
+        objs = stream(otype, event.gets, event.sets, keyz=keyz)
+        query = (otype, event.gets)
+    else:
+        objs = pfind(otype, event.gets, timed=event.sets, limit=limit, keyz=keyz)
+    rows = (
+            "%s %s %s" % (
+                          str(nmr),
+                          printable(obj, keyz or keys(obj), event.toskip),
+                          elapsed(time.time()-fntime(obj.__fnm__))
+                         )
+            for nmr, obj in enumerate(objs)
+           )
+    if not Cursor.page(event, rows, query):
         event.reply("no result (%s)" % event.txt)
+
@@ -8,25 +8,16 @@
 ## import
 
 
-import datetime
-import getpass
-import inspect
-import json
-import os
-import pathlib
-import pwd
 import queue
 import threading
 import time
-import traceback
-import types
-import uuid
 
 
-from stat import ST_UID, ST_MODE, S_IMODE
-
-
-from .obj import Default, Object, register
+from .err import Errors
+from .mtr import Metrics
+from .obj import Cache, Default, Object, dumps, items, loads, register
+from .rec import Recorder
+from .trc import Trace
 from .thr import launch
 from. utl import elapsed
 
@@ -57,6 +48,11 @@ class Bus(Object):
                 break
         return res
 
+    @staticmethod
+    def remove(obj):
+        if obj in Bus.objs:
+            Bus.objs.remove(obj)
+
     @staticmethod
     def say(orig, channel, txt):
         bot = Bus.byorig(orig)
@@ -66,39 +62,78 @@ class Bus(Object):
 
 class Callback(Object):
 
-    cbs = Object()
-    errors = []
-    
-    def register(self, typ, cbs):
-        if typ not in self.cbs:
-            setattr(self.cbs, typ, cbs)
+    """Per handler table of callbacks by event type. A type can have any
+       number of callbacks, each with an optional filter on channel,
+       origin and command prefix that register() compiles into one
+       predicate, callbacks whose filter does not match are never
+       called. With concurrent set the matching callbacks of an event
+       run in threads of their own, the handler moves on when all are
+       done.
+    """
+
+    def __init__(self):
+        Object.__init__(self)
+        self.cbs = {}
+        self.concurrent = False
+
+    def register(self, typ, func, channel=None, orig=None, prefix=None):
+        "add func for typ, registering the same func and filter twice is a no-op."
+        key = (func, channel, orig, prefix)
+        subs = self.cbs.setdefault(typ, [])
+        for sub in subs:
+            if sub[0] == key:
+                return
+        subs.append((key, func, compiled(channel, orig, prefix)))
+
+    def unregister(self, typ, func):
+        self.cbs[typ] = [x for x in self.cbs.get(typ, []) if x[1] != func]
 
     def callback(self, event):
-        func = getattr(self.cbs, event.type, None)
-        if not func:
+        funcs = [
+                 func
+                 for _key, func, pred in self.cbs.get(event.type, ())
+                 if pred is None or pred(event)
+                ]
+        if not funcs:
             event.ready()
             return
+        if self.concurrent and len(funcs) > 1:
+            thrs = [launch(self.invoke, func, event, name="callback") for func in funcs[1:]]
+            self.invoke(funcs[0], event)
+            for thr in thrs:
+                thr.join()
+            return
+        for func in funcs:
+            self.invoke(func, event)
+
+    def dispatch(self, event):
+        self.callback(event)
+
+    def get(self, typ):
+        return [x[1] for x in self.cbs.get(typ, ())]
+
+    def invoke(self, func, event):
         try:
             func(event)
         except Exception as ex:
-            Callback.errors.append(ex)
+            Metrics.inc("run_errors_total")
+            Errors.add(ex)
             event._exc = ex
             event.ready()
-            
-    def dispatch(self, event):
-        self.callback(event)
-
-    def get(self, typ):
-        return getattr(self.cbs, typ)
 
 
 class Command(Object):
 
     cmd = Object()
+    procs = []
 
     @staticmethod
-    def add(cmd):
+    def add(cmd, process=False):
+        "commands added with process=True, or with cmd.process set, run in the process pool."
         setattr(Command.cmd, cmd.__name__, cmd)
+        if process or getattr(cmd, "process", False):
+            if cmd.__name__ not in Command.procs:
+                Command.procs.append(cmd.__name__)
 
     @staticmethod
     def get(cmd):
@@ -106,17 +141,74 @@ class Command(Object):
 
     @staticmethod
     def handle(evt):
-        if not evt.isparsed:
-            evt.parse()
-        func = Command.get(evt.cmd)
-        if func:
-            func(evt)
-            evt.show()
+        started = time.time()
+        traced = Trace.begin(evt)
+        try:
+            if traced:
+                evt._spans.append(("queue", evt.createtime, started - evt.createtime, 0))
+            with Trace.span("parse"):
+                if not evt.isparsed:
+                    evt.parse()
+            func = Command.get(evt.cmd)
+            if func and evt.cmd in Command.procs:
+                with Trace.span("submit"):
+                    Command.submit(func, evt, started)
+                return
+            if func:
+                with Trace.span("command"):
+                    func(evt)
+                with Trace.span("show"):
+                    evt.show()
+            Command.done(evt, started)
+        except Exception:
+            Trace.finish(evt)
+            raise
+        finally:
+            if traced:
+                Trace.detach()
+
+    @staticmethod
+    def done(evt, started):
         evt.ready()
+        Metrics.inc("run_events_handled_total")
+        Trace.finish(evt)
+        if Recorder.ofile:
+            Recorder.record(evt, started, time.time())
 
     @staticmethod
     def remove(cmd):
         delattr(Command.cmd, cmd)
+        if cmd in Command.procs:
+            Command.procs.remove(cmd)
+
+    @staticmethod
+    def submit(func, evt, started):
+        "run func in the process pool, the reply lines come back to evt.show()."
+        from .prl import Pool
+        if isinstance(evt, Msg):
+            txt = dumps({"channel": evt.channel, "orig": evt.orig, "otxt": evt.otxt, "txt": evt.txt})
+        else:
+            txt = dumps(evt)
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            future = Pool.get().submit(remote, func.__module__, func.__name__, txt)
+        except BrokenProcessPool:
+            Pool.drop()
+            raise
+
+        def finished(fut):
+            try:
+                evt.result.extend(fut.result())
+                evt.show()
+            except Exception as ex:
+                if isinstance(ex, BrokenProcessPool):
+                    Pool.drop()
+                Metrics.inc("run_errors_total")
+                Errors.add(ex)
+                evt._exc = ex
+            Command.done(evt, started)
+
+        future.add_done_callback(finished)
 
 
 class Parsed(Default):
@@ -210,6 +302,130 @@ class Event(Parsed):
         self.__ready__.wait()
 
 
+class Msg:
+
+    """Slotted stand-in for Event on busy paths. gets, sets and toskip are
+       only built when touched, the threading.Event behind wait() only
+       when somebody waits before ready(). Attributes it has no slot for
+       read as "" but can't be set. Msg.get() hands out a pooled
+       instance, release() resets it and puts it back, call that only
+       when nothing refers to the message anymore.
+    """
+
+    __slots__ = (
+                 "_exc", "_gets", "_ready", "_sets", "_spans", "_toskip", "_traceid",
+                 "args", "channel", "cmd", "console", "control", "createtime", "done",
+                 "index", "isparsed", "opts", "orig", "otxt", "recorded", "rest",
+                 "result", "txt", "type", "verbose"
+                )
+
+    lock = threading.Lock()
+    max = 1024
+    pool = []
+
+    def __init__(self, txt=""):
+        self._exc = None
+        self._gets = None
+        self._ready = None
+        self._sets = None
+        self._spans = None
+        self._toskip = None
+        self._traceid = ""
+        self.args = ()
+        self.channel = ""
+        self.cmd = ""
+        self.console = ""
+        self.control = "!"
+        self.createtime = time.time()
+        self.done = False
+        self.index = None
+        self.isparsed = False
+        self.opts = ""
+        self.orig = ""
+        self.otxt = ""
+        self.recorded = ""
+        self.rest = ""
+        self.result = []
+        self.txt = txt
+        self.type = "event"
+        self.verbose = ""
+
+    def __getattr__(self, key):
+        "unknown attributes read as \"\", like they do on an Event."
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return ""
+
+    @property
+    def gets(self):
+        if self._gets is None:
+            self._gets = Default()
+        return self._gets
+
+    @property
+    def sets(self):
+        if self._sets is None:
+            self._sets = Default()
+        return self._sets
+
+    @property
+    def toskip(self):
+        if self._toskip is None:
+            self._toskip = Default()
+        return self._toskip
+
+    parse = Parsed.parse
+
+    @staticmethod
+    def get(txt=""):
+        "a Msg from the pool, or a new one when the pool is empty."
+        try:
+            msg = Msg.pool.pop()
+        except IndexError:
+            return Msg(txt)
+        msg.txt = txt
+        msg.createtime = time.time()
+        return msg
+
+    def bot(self):
+        return Bus.byorig(self.orig)
+
+    def error(self):
+        pass
+
+    def ok(self):
+        Bus.say(self.orig, self.channel, 'ok %s' % elapsed(time.time()-self.createtime))
+
+    def ready(self):
+        self.done = True
+        rdy = self._ready
+        if rdy is not None:
+            rdy.set()
+
+    def release(self):
+        "reset and return to the pool."
+        self.__init__()
+        if len(Msg.pool) < Msg.max:
+            Msg.pool.append(self)
+
+    def reply(self, txt):
+        self.result.append(txt)
+
+    def show(self):
+        for txt in self.result:
+            Bus.say(self.orig, self.channel, txt)
+
+    def wait(self, timeout=None):
+        if self.done:
+            return True
+        with Msg.lock:
+            if self._ready is None:
+                self._ready = threading.Event()
+        if self.done:
+            return True
+        return self._ready.wait(timeout)
+
+
 class Handler(Callback):
 
     def __init__(self):
@@ -231,8 +447,11 @@ class Handler(Callback):
         self.dispatch(event)
 
     def loop(self):
-        while not self.stopped.set():
-            self.handle(self.poll())
+        while not self.stopped.is_set():
+            event = self.poll()
+            if event is None:
+                break
+            self.handle(event)
 
     def poll(self):
         return self.queue.get()
@@ -252,6 +471,7 @@ class Handler(Callback):
 
     def stop(self):
         self.stopped.set()
+        self.queue.put_nowait(None)
 
     def start(self):
         self.stopped.clear()
@@ -262,9 +482,46 @@ class Handler(Callback):
             time.sleep(1.0)
 
 
+class Remote(Event):
+
+    "the Event a pool process runs a command with, ok() becomes a reply."
+
+    skip = ("__ready__", "_spans", "_traceid", "args", "errors", "gets", "isparsed", "result", "sets", "toskip")
+
+    def ok(self):
+        self.reply('ok %s' % elapsed(time.time()-self.createtime))
+
+
 ## utility
 
 
+def compiled(channel=None, orig=None, prefix=None):
+    """one predicate for a callback filter, None when it matches every event.
+       channel and orig take a string or a list of them, prefix is matched
+       against the start of the event's text.
+    """
+    checks = []
+    if channel is not None:
+        chans = frozenset([channel] if isinstance(channel, str) else channel)
+        checks.append(lambda evt: evt.channel in chans)
+    if orig is not None:
+        origs = frozenset([orig] if isinstance(orig, str) else orig)
+        checks.append(lambda evt: evt.orig in origs)
+    if prefix:
+        prefixes = (prefix,) if isinstance(prefix, str) else tuple(prefix)
+        checks.append(lambda evt: evt.txt.startswith(prefixes))
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda evt: all([x(evt) for x in checks])
+
+
+def depth():
+    "events waiting on the queues of all handlers on the bus."
+    return sum([x.queue.qsize() for x in list(Bus.objs) if "queue" in x])
+
+
 def parse(txt):
     prs = Parsed()
     prs.parse(txt)
@@ -274,3 +531,24 @@ def parse(txt):
         prs.verbose = True
     return prs
 
+
+def remote(modname, cmdname, txt):
+    "runs in a pool process, returns the reply lines. saves of other processes get polled first."
+    import importlib
+    if Cache.enabled:
+        from .jrn import Journal
+        Journal.poll()
+    func = getattr(importlib.import_module(modname), cmdname)
+    evt = Remote()
+    for key, value in items(loads(txt)):
+        if key not in Remote.skip:
+            setattr(evt, key, value)
+    evt.parse(evt.otxt or evt.txt)
+    func(evt)
+    return evt.result
+
+
+## runtime
+
+
+Metrics.gauge("run_queue_depth", depth, "events waiting in handler queues")
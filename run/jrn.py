@@ -0,0 +1,139 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"journal"
+
+
+## import
+
+
+import os
+import threading
+
+
+from .obj import Cache, Digest, Watch, Wd, cdir, fnclass, hook
+from .thr import Repeater
+from .utl import Flock
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Journal',
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Journal:
+
+    """Shared change journal for processes that use the same Wd.workdir.
+
+       Every save appends "pid type/uuid/day/time" to Wd.workdir/journal
+       under an exclusive flock. poll() reads what other processes
+       appended since the last poll and drops the cached listings and save
+       digests those saves made stale, so each process can keep a warm
+       Cache. Remote saves are also passed on to change feed subscribers.
+
+    """
+
+    ino = None
+    lock = threading.Lock()
+    max = 1024 * 1024
+    offset = 0
+    repeater = None
+
+    @staticmethod
+    def append(obj, _path):
+        Journal.write("%s %s\n" % (os.getpid(), obj.__fnm__))
+
+    @staticmethod
+    def changed(fnm):
+        "forget what a remote save of fnm made stale, tell the change feed."
+        Cache.invalidate(fnclass(fnm))
+        Digest.digests.pop(os.sep.join(fnm.split(os.sep)[:2]), None)
+        from .fed import Feed
+        if Feed.subs:
+            path = Wd.getpath(fnm)
+            Feed.publish(hook(path), path)
+
+    @staticmethod
+    def lockpath():
+        return Journal.path() + ".lock"
+
+    @staticmethod
+    def path():
+        return os.path.join(Wd.get(), "journal")
+
+    @staticmethod
+    def poll():
+        with Journal.lock:
+            path = Journal.path()
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return 0
+            if stat.st_ino != Journal.ino:
+                if Journal.ino is None:
+                    Journal.offset = stat.st_size
+                else:
+                    Cache.invalidate()
+                    Digest.digests.clear()
+                    Journal.offset = 0
+                Journal.ino = stat.st_ino
+            if stat.st_size <= Journal.offset:
+                return 0
+            with Flock(Journal.lockpath(), shared=True):
+                with open(path, "r", encoding="utf-8") as ifile:
+                    ifile.seek(Journal.offset)
+                    data = ifile.read()
+            Journal.offset += len(data.encode("utf-8"))
+        nr = 0
+        pid = str(os.getpid())
+        for line in data.splitlines():
+            opid, _sep, fnm = line.partition(" ")
+            if opid == pid or not fnm:
+                continue
+            Journal.changed(fnm)
+            nr += 1
+        return nr
+
+    @staticmethod
+    def start(sleep=1.0):
+        "journal local saves, poll for remote ones and switch on the cache."
+        Journal.write("")
+        Journal.poll()
+        Watch.add(Journal.append)
+        Cache.enabled = True
+        if sleep and not Journal.repeater:
+            Journal.repeater = Repeater(sleep, Journal.poll, thrname="journal")
+            Journal.repeater.start()
+
+    @staticmethod
+    def stop():
+        Watch.remove(Journal.append)
+        Cache.enabled = False
+        Cache.invalidate()
+        if Journal.repeater:
+            Journal.repeater.stop()
+            Journal.repeater = None
+
+    @staticmethod
+    def write(line):
+        path = Journal.path()
+        cdir(path)
+        with Flock(Journal.lockpath()):
+            try:
+                if os.path.getsize(path) > Journal.max:
+                    os.replace(path, path + ".1")
+            except FileNotFoundError:
+                pass
+            with open(path, "a", encoding="utf-8") as ofile:
+                ofile.write(line)
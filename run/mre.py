@@ -0,0 +1,126 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"more"
+
+
+## import
+
+
+import itertools
+import os
+import threading
+import time
+
+
+from .mtr import Metrics
+from .slw import Query
+from .trc import Trace
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Cursor',
+            'mre'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Cursor:
+
+    """Pages of reply lines. A command hands its rows as an iterator to
+       page(), the first size rows get replied and the rest stays on a
+       cursor with a random token that mre <token> continues. A plain mre
+       continues the last cursor of the same handler and channel, daemon
+       clients connect anew for every command and need the token. Cursors
+       idle for more than idle seconds are dropped, a size of 0 replies
+       every row at once.
+    """
+
+    cursors = {}
+    idle = 600.0
+    last = {}
+    lock = threading.Lock()
+    size = 0
+
+    @staticmethod
+    def evict():
+        now = time.time()
+        with Cursor.lock:
+            for token, (_rows, _query, stamp, owner) in list(Cursor.cursors.items()):
+                if now - stamp > Cursor.idle:
+                    del Cursor.cursors[token]
+                    if Cursor.last.get(owner) == token:
+                        del Cursor.last[owner]
+
+    @staticmethod
+    def next(event):
+        "reply the next page of the event's cursor, 0 when there is none."
+        Cursor.evict()
+        owner = (event.orig, event.channel)
+        with Cursor.lock:
+            token = event.args and event.args[0] or Cursor.last.get(owner)
+            rows, query, _stamp, prev = Cursor.cursors.pop(token, (None, None, None, None))
+            if prev and Cursor.last.get(prev) == token:
+                del Cursor.last[prev]
+        if rows is None:
+            return 0
+        return Cursor.show(event, rows, token, query)
+
+    @staticmethod
+    def page(event, rows, query=None):
+        """reply the first page of rows, keep the rest for mre, returns the
+           rows replied. query is the (otp, selector) rows are streamed from.
+        """
+        Cursor.evict()
+        owner = (event.orig, event.channel)
+        with Cursor.lock:
+            Cursor.cursors.pop(Cursor.last.pop(owner, None), None)
+        return Cursor.show(event, rows, os.urandom(4).hex(), query)
+
+    @staticmethod
+    def show(event, rows, token, query=None):
+        if not query:
+            return Cursor.showing(event, iter(rows), token, query)
+        started = time.time()
+        with Trace.span("find"), Query("stream", *query) as qry:
+            nr = Cursor.showing(event, iter(rows), token, query)
+            qry.matches = nr
+        Metrics.observe("run_find_seconds", time.time() - started)
+        return nr
+
+    @staticmethod
+    def showing(event, rows, token, query):
+        nr = 0
+        for txt in itertools.islice(rows, Cursor.size or None):
+            event.reply(txt)
+            nr += 1
+        if not Cursor.size:
+            return nr
+        try:
+            nxt = next(rows)
+        except StopIteration:
+            return nr
+        owner = (event.orig, event.channel)
+        with Cursor.lock:
+            Cursor.cursors[token] = (itertools.chain([nxt], rows), query, time.time(), owner)
+            Cursor.last[owner] = token
+        event.reply("use mre %s for more" % token)
+        return nr
+
+
+## command
+
+
+def mre(event):
+    if not Cursor.next(event):
+        event.reply("no more results")
@@ -0,0 +1,161 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"metrics"
+
+
+## import
+
+
+import os
+import threading
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Metrics',
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Metrics:
+
+    """Counters, gauges and summaries in one registry, exposed in the
+       Prometheus text format. Gauges are functions that get called when
+       the text is rendered, summaries keep a _sum and a _count. start()
+       writes Wd.workdir/metrics.prom every sleep seconds and, given a
+       port, serves the same text on http://127.0.0.1:port/metrics.
+    """
+
+    counters = {}
+    gauges = {}
+    helps = {}
+    lock = threading.Lock()
+    repeater = None
+    server = None
+    summaries = {}
+
+    @staticmethod
+    def gauge(name, func, txt=""):
+        Metrics.gauges[name] = func
+        if txt:
+            Metrics.helps[name] = txt
+
+    @staticmethod
+    def header(name, typ):
+        res = []
+        if name in Metrics.helps:
+            res.append("# HELP %s %s" % (name, Metrics.helps[name]))
+        res.append("# TYPE %s %s" % (name, typ))
+        return res
+
+    @staticmethod
+    def inc(name, value=1):
+        with Metrics.lock:
+            Metrics.counters[name] = Metrics.counters.get(name, 0) + value
+
+    @staticmethod
+    def observe(name, value):
+        with Metrics.lock:
+            total, count = Metrics.summaries.get(name, (0.0, 0))
+            Metrics.summaries[name] = (total + value, count + 1)
+
+    @staticmethod
+    def path():
+        from .obj import Wd
+        return os.path.join(Wd.get(), "metrics.prom")
+
+    @staticmethod
+    def reset():
+        with Metrics.lock:
+            Metrics.counters.clear()
+            Metrics.summaries.clear()
+
+    @staticmethod
+    def serve(port):
+        "answer GET /metrics on 127.0.0.1:port from a thread."
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from .thr import launch
+
+        class Scrape(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                data = Metrics.text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        Metrics.server = ThreadingHTTPServer(("127.0.0.1", port), Scrape)
+        Metrics.server.daemon_threads = True
+        launch(Metrics.server.serve_forever, name="metrics")
+        return Metrics.server.server_address[1]
+
+    @staticmethod
+    def start(sleep=15.0, port=0):
+        from .thr import Repeater
+        Metrics.write()
+        if sleep and not Metrics.repeater:
+            Metrics.repeater = Repeater(sleep, Metrics.write, thrname="metrics")
+            Metrics.repeater.start()
+        if port and not Metrics.server:
+            Metrics.serve(port)
+
+    @staticmethod
+    def stop():
+        if Metrics.repeater:
+            Metrics.repeater.stop()
+            Metrics.repeater = None
+        if Metrics.server:
+            Metrics.server.shutdown()
+            Metrics.server.server_close()
+            Metrics.server = None
+
+    @staticmethod
+    def text():
+        with Metrics.lock:
+            counters = dict(Metrics.counters)
+            summaries = dict(Metrics.summaries)
+        lines = []
+        for name, value in sorted(counters.items()):
+            lines.extend(Metrics.header(name, "counter"))
+            lines.append("%s %s" % (name, value))
+        for name, func in sorted(Metrics.gauges.items()):
+            try:
+                value = func()
+            except Exception:
+                continue
+            lines.extend(Metrics.header(name, "gauge"))
+            lines.append("%s %s" % (name, value))
+        for name, (total, count) in sorted(summaries.items()):
+            lines.extend(Metrics.header(name, "summary"))
+            lines.append("%s_sum %s" % (name, total))
+            lines.append("%s_count %s" % (name, count))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def write():
+        "replace metrics.prom in one rename, scrapers never see half a file."
+        from .obj import cdir
+        path = Metrics.path()
+        cdir(path)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as ofile:
+            ofile.write(Metrics.text())
+        os.replace(tmp, path)
@@ -50,21 +50,17 @@ Great for giving objects peristence by having their state stored in files.
 
 
 import datetime
-import getpass
-import inspect
 import json
 import os
-import pathlib
-import pwd
-import queue
+import re
 import threading
 import time
-import traceback
 import types
-import uuid
 
 
-from stat import ST_UID, ST_MODE, S_IMODE
+from .mtr import Metrics
+from .slw import Query, Slow
+from .trc import Trace
 
 
 ## define
@@ -72,32 +68,51 @@ from stat import ST_UID, ST_MODE, S_IMODE
 
 def __dir__():
     return (
+            'Cache',
             'Class',
+            'Codec',
             'Db',
             'Default',
+            'Digest',
             'Object',
             'ObjectDecoder',
             'ObjectEncoder',
+            'Record',
+            'Watch',
             'Wd',
             'cdir',
+            'days',
             'dump',
             'dumps',
             'edit',
+            'fields',
             'find',
             'fns',
             'fntime',
             'hook',
+            'ident',
             'items',
             'keys',
             'kind',
             'last',
+            'listing',
             'load',
             'loads',
+            'partial',
             'match',
             'name',
+            'newest',
+            'payload',
             'printable',
+            'project',
+            'rebuild',
             'register',
+            'revive',
             'save',
+            'selected',
+            'stream',
+            'timerange',
+            'totime',
             'update',
             'values',
            )
@@ -134,11 +149,7 @@ class Object:
 
     def __init__(self, *args, **kwargs):
         object.__init__(self)
-        self.__fnm__ = os.path.join(
-            kind(self),
-            str(uuid.uuid4().hex),
-            os.sep.join(str(datetime.datetime.now()).split()),
-        )
+        self.__fnm__ = ident(self)
         if args:
             val = args[0]
             if isinstance(val, zip):
@@ -147,12 +158,20 @@ class Object:
                 update(self, val)
             elif isinstance(val, Object):
                 update(self, vars(val))
+            elif isinstance(val, Record):
+                update(self, val)
         if kwargs:
             self.__dict__.update(kwargs)
 
     def __delitem__(self, key):
         self.__dict__.__delitem__(key)
 
+    def __getattr__(self, key):
+        if key == "__fnm__":
+            self.__fnm__ = ident(self)
+            return self.__fnm__
+        raise AttributeError(key)
+
     def __getitem__(self, key):
         self.__dict__.__getitem__(key)
           
@@ -178,21 +197,91 @@ class Default(Object):
         self.__default__ = ""
 
     def __getattr__(self, key):
+        if key == "__fnm__":
+            return Object.__getattr__(self, key)
         return self.__dict__.get(key, self.__default__)
 
 
+class Record:
+
+    """Record is an Object with a fixed schema, fields are declared as
+       __slots__ on the subclass so instances carry no __dict__::
+
+        >>> class Log(Record):
+        ...     __slots__ = ("txt",)
+
+       Fields start out as "", unknown keys are skipped on update/load.
+
+    """
+
+    __slots__ = ("__fnm__",)
+
+    schemas = {}
+
+    def __init__(self, *args, **kwargs):
+        self.__fnm__ = ident(self)
+        for key in fields(self):
+            setattr(self, key, "")
+        if args:
+            val = args[0]
+            if isinstance(val, zip):
+                update(self, dict(val))
+            elif isinstance(val, (dict, Object, Record)):
+                update(self, val)
+        if kwargs:
+            update(self, kwargs)
+
+    def __iter__(self):
+        return iter(fields(self))
+
+    def __len__(self):
+        return len(fields(self))
+
+    def __str__(self):
+        return str(dict(items(self)))
+
+
+def fields(obj):
+    "the declared fields of a Record (sub)class or instance, cached per class."
+    clz = obj if isinstance(obj, type) else type(obj)
+    res = Record.schemas.get(clz)
+    if res is None:
+        res = []
+        for base in reversed(clz.__mro__):
+            for key in getattr(base, "__slots__", ()):
+                if not key.startswith("__") and key not in res:
+                    res.append(key)
+        res = Record.schemas[clz] = tuple(res)
+    return res
+
+
 def edit(obj, setter):
     for key, value in items(setter):
         register(obj, key, value)
 
 
+def ident(obj):
+    "a fresh type/uuid/day/time __fnm__ for obj."
+    return os.sep.join((
+        kind(obj),
+        os.urandom(16).hex(),
+        str(datetime.datetime.now()).replace(" ", os.sep)
+    ))
+
+
 def items(obj):
     if isinstance(obj, type({})):
         return obj.items()
+    if isinstance(obj, Record):
+        return [(x, getattr(obj, x)) for x in fields(obj)]
     return obj.__dict__.items()
 
 
 def keys(obj):
+    if isinstance(obj, type({})):
+        return obj.keys()
+    if isinstance(obj, Record):
+        return fields(obj)
     return obj.__dict__.keys()
 
 
@@ -221,8 +310,10 @@ def name(obj):
 def printable(obj, args="", skip="", plain=False):
     res = []
     keyz = []
-    if "," in args:
-        keyz = args.split(",")
+    if isinstance(args, str):
+        keyz = [x for x in args.split(",") if x]
+    elif args:
+        keyz = list(args)
     if not keyz:
         keyz = keys(obj)
     for key in keyz:
@@ -254,116 +345,339 @@ def register(obj, key, value):
 
 
 def update(obj, data):
+    if isinstance(obj, Record):
+        schema = fields(obj)
+        for key, value in items(data):
+            if key in schema:
+                setattr(obj, key, value)
+        return
     for key, value in items(data):
         setattr(obj, key, value)
 
 
 def values(obj):
+    if isinstance(obj, Record):
+        return [getattr(obj, x) for x in fields(obj)]
     return obj.__dict__.values()
 
 
+def payload(obj):
+    "the dict that gets written to disk for obj."
+    if isinstance(obj, Record):
+        return dict(items(obj))
+    return obj.__dict__
+
+
 ## json
 
 
 class ObjectDecoder(json.JSONDecoder):
 
+    """json decoder that turns {"__kind__": ...} dicts back into instances
+       of the registered Class, a top level dict becomes an Object.
+    """
+
+    builders = {}
+
     def  __init__(self, *args, **kwargs):
         ""
+        kwargs.setdefault("object_hook", rebuild)
         json.JSONDecoder.__init__(self, *args, **kwargs)
 
     def decode(self, s, _w=None):
         ""
-        value = json.loads(s)
-        return Object(value)
-
-    def raw_decode(self, s, *args, **kwargs):
-        ""
-        return json.JSONDecoder.raw_decode(self, s, *args, **kwargs)
+        value = json.JSONDecoder.decode(self, s)
+        if isinstance(value, dict):
+            return Object(value)
+        return value
 
 
 class ObjectEncoder(json.JSONEncoder):
 
-    def  __init__(self, *args, **kwargs):
-        ""
-        json.JSONEncoder.__init__(self, *args, **kwargs)
+    """json encoder with one encode function per class, looked up by type
+       and built on first use. Objects and Records get a __kind__ key so
+       nested instances decode to their own class again.
+    """
 
-    def encode(self, o):
-        ""
-        return json.JSONEncoder.encode(self, o)
+    encoders = {}
 
     def default(self, o):
         ""
-        if isinstance(o, dict):
-            return o.items()
-        if isinstance(o, Object):
-            return vars(o)
-        if isinstance(o, list):
-            return iter(o)
-        if isinstance(o,
-                      (type(str), type(True), type(False),
-                       type(int), type(float))
-                     ):
-            return o
+        func = ObjectEncoder.encoders.get(type(o))
+        if func is None:
+            func = ObjectEncoder.encoders[type(o)] = encoder(type(o))
+        return func(o)
+
+
+def encoder(clz):
+    "the encode function for instances of clz."
+    knd = str(clz).split()[-1][1:-2]
+    if issubclass(clz, Object):
+        def objenc(obj):
+            res = dict(obj.__dict__)
+            res["__kind__"] = knd
+            return res
+        return objenc
+    if issubclass(clz, Record):
+        def recenc(obj):
+            res = dict(items(obj))
+            res["__kind__"] = knd
+            return res
+        return recenc
+    if issubclass(clz, (set, frozenset, tuple)):
+        return list
+    return str
+
+
+def builder(clz):
+    """the function that turns a decoded dict into an instance of clz.
+       Object classes without an __init__ of their own skip it, their
+       __fnm__ is only made when it's read.
+    """
+    if issubclass(clz, Object) and clz.__init__ in (Object.__init__, Default.__init__):
+        dflt = issubclass(clz, Default)
+        def objbld(dct):
+            obj = clz.__new__(clz)
+            if dflt:
+                obj.__default__ = ""
+            obj.__dict__.update(dct)
+            return obj
+        return objbld
+    def newbld(dct):
         try:
-            return json.JSONEncoder.default(self, o)
+            obj = clz()
         except TypeError:
-            return str(o)
+            return Object(dct)
+        update(obj, dct)
+        return obj
+    return newbld
 
-    def iterencode(self, o, *args, **kwargs):
-        ""
-        return json.JSONEncoder.iterencode(self, o, *args, **kwargs)
+
+def rebuild(dct):
+    "object_hook that constructs registered classes from their __kind__."
+    knd = dct.pop("__kind__", None)
+    if knd is None:
+        return dct
+    clz = Class.get(knd) or Object
+    func = ObjectDecoder.builders.get(clz)
+    if func is None:
+        func = ObjectDecoder.builders[clz] = builder(clz)
+    return func(dct)
+
+
+def revive(value):
+    "rebuild() applied to data that was decoded without the object_hook."
+    if isinstance(value, dict):
+        return rebuild({x: revive(y) for x, y in value.items()})
+    if isinstance(value, list):
+        return [revive(x) for x in value]
+    return value
+
+
+class Codec:
+
+    "shared encoder/decoder instances, they keep no state between calls."
+
+    decoder = ObjectDecoder()
+    encoder = ObjectEncoder()
+    plain = json.JSONDecoder()
+    store = ObjectEncoder(indent=4, sort_keys=True)
 
 
 def dump(obj, opath):
     cdir(opath)
     with open(opath, "w", encoding="utf-8") as ofile:
         json.dump(
-            obj.__dict__, ofile, cls=ObjectEncoder, indent=4, sort_keys=True
+            payload(obj), ofile, cls=ObjectEncoder, indent=4, sort_keys=True
         )
     return opath
 
 
 def dumps(obj):
-    return json.dumps(obj, cls=ObjectEncoder)
+    return Codec.encoder.encode(obj)
 
 
 def load(obj, opath):
     splitted = opath.split(os.sep)
     fnm = os.sep.join(splitted[-4:])
     lpath = os.path.join(Wd.workdir, "store", fnm)
-    if os.path.exists(lpath):
+    Metrics.inc("run_loads_total")
+    if Cache.enabled:
+        txt = Cache.read(lpath)
+    elif os.path.exists(lpath):
         with open(lpath, "r", encoding="utf-8") as ofile:
-            res = json.load(ofile, cls=ObjectDecoder)
-            update(obj, res)
+            txt = ofile.read()
+    else:
+        txt = None
+    if txt is not None:
+        Slow.count("files")
+        Slow.count("bytes", len(txt))
+        update(obj, Codec.decoder.decode(txt))
     obj.__fnm__ = fnm
 
 
 def loads(jss):
-    return json.loads(jss, cls=ObjectDecoder)
+    return Codec.decoder.decode(jss)
 
 
 def save(obj):
+    with Trace.span("save"):
+        return saving(obj)
+
+
+def saving(obj):
     prv = os.sep.join(obj.__fnm__.split(os.sep)[:2])
+    txt = Codec.store.encode(payload(obj))
+    digest = Digest.digest(txt)
+    if Digest.unchanged(prv, digest) and isnewest(obj.__fnm__):
+        Metrics.inc("run_saves_skipped_total")
+        return obj.__fnm__
     obj.__fnm__ = os.path.join(prv, os.sep.join(str(datetime.datetime.now()).split()))
     opath = Wd.getpath(obj.__fnm__)
-    dump(obj, opath)
-    os.chmod(opath, 0o444)
+    cdir(opath)
+    if not Digest.cas or not Digest.link(digest, txt, opath):
+        with open(opath, "w", encoding="utf-8") as ofile:
+            ofile.write(txt)
+        os.chmod(opath, 0o444)
+        Metrics.inc("run_bytes_written_total", len(txt))
+    Metrics.inc("run_saves_total")
+    Digest.set(prv, digest)
+    if Cache.enabled:
+        Cache.invalidate(fnclass(obj.__fnm__))
+    if Watch.cbs:
+        Watch.fire(obj, opath)
     return obj.__fnm__
 
 
+## projection
+
+
+SCALAR = re.compile(r'[^,}\]\s]*')
+SPACE = re.compile(r'[ \t\n\r]*')
+TOKEN = re.compile(r'["\[\]{}]')
+
+
+def skip(txt, idx):
+    "index just past the json value that starts at idx, nothing gets decoded."
+    char = txt[idx]
+    if char == '"':
+        return strend(txt, idx)
+    if char not in "[{":
+        return SCALAR.match(txt, idx).end()
+    depth = 0
+    while True:
+        mtc = TOKEN.search(txt, idx)
+        if not mtc:
+            raise ValueError("unterminated value at %s" % idx)
+        char = mtc.group()
+        if char == '"':
+            idx = strend(txt, mtc.start())
+            continue
+        idx = mtc.end()
+        if char in "[{":
+            depth += 1
+            continue
+        depth -= 1
+        if not depth:
+            return idx
+
+
+def strend(txt, idx):
+    "index just past the json string that starts at idx."
+    end = idx
+    while True:
+        end = txt.find('"', end + 1)
+        if end == -1:
+            raise ValueError("unterminated string at %s" % idx)
+        bsl = end - 1
+        while txt[bsl] == "\\":
+            bsl -= 1
+        if (end - bsl) % 2:
+            return end + 1
+
+
+def project(txt, keyz, decoder=None):
+    """decode only keyz of the top level json object in txt, the values of
+       other keys are skipped over by a scanner without building them.
+       decoder defaults to Codec.decoder, Codec.plain leaves nested
+       objects as dicts.
+    """
+    decoder = decoder or Codec.decoder
+    wanted = set(keyz)
+    res = {}
+    try:
+        idx = SPACE.match(txt).end()
+        if txt[idx] != "{":
+            raise ValueError("not a json object")
+        idx += 1
+        while wanted:
+            idx = SPACE.match(txt, idx).end()
+            if txt[idx] == "}":
+                break
+            key, idx = json.decoder.scanstring(txt, idx + 1)
+            idx = SPACE.match(txt, idx).end() + 1
+            idx = SPACE.match(txt, idx).end()
+            if key in wanted:
+                res[key], idx = decoder.raw_decode(txt, idx)
+                wanted.discard(key)
+            else:
+                idx = skip(txt, idx)
+            idx = SPACE.match(txt, idx).end()
+            if txt[idx] == ",":
+                idx += 1
+    except (AttributeError, IndexError, ValueError):
+        data = decoder.decode(txt)
+        return {x: y for x, y in items(data) if x in keyz}
+    return res
+
+
+def partial(path, keyz):
+    "hook() that only fills in keyz."
+    cls = Class.get(fnclass(path))
+    obj = cls() if cls else Object()
+    fnm = os.sep.join(path.split(os.sep)[-4:])
+    lpath = os.path.join(Wd.workdir, "store", fnm)
+    Metrics.inc("run_loads_total")
+    if Cache.enabled:
+        txt = Cache.read(lpath)
+    elif os.path.exists(lpath):
+        with open(lpath, "r", encoding="utf-8") as ifile:
+            txt = ifile.read()
+    else:
+        txt = None
+    if txt is not None:
+        Slow.count("files")
+        Slow.count("bytes", len(txt))
+        update(obj, project(txt, keyz))
+    obj.__fnm__ = fnm
+    return obj
+
+
 ## database
 
 
 class Db:
 
     @staticmethod
-    def find(otp, selector=None, index=None, timed=None, deleted=False):
+    def find(otp, selector=None, index=None, timed=None, deleted=False, limit=None, keyz=None):
+        with Query("Db.find", otp, selector) as qry:
+            Slow.resolved([otp])
+            paths = newest(otp, timed) if limit else fns(otp, timed)
+            res = Db.select(paths, selector, index, deleted, limit, keyz)
+            qry.matches = len(res)
+            return res
+
+    @staticmethod
+    def select(paths, selector=None, index=None, deleted=False, limit=None, keyz=None):
+        "load and filter paths, for callers that listed them already."
         if selector is None:
             selector = {}
+        if keyz:
+            keyz = set(keyz) | set(keys(selector)) | {"__deleted__"}
         nmr = -1
         res = []
-        for fnm in fns(otp, timed):
-            obj = hook(fnm)
+        for fnm in paths:
+            obj = partial(fnm, keyz) if keyz else hook(fnm)
             if deleted and "__deleted__" in obj and obj.__deleted__:
                 continue
             if selector and not search(obj, selector):
@@ -371,53 +685,125 @@ class Db:
             nmr += 1
             if index is not None and nmr != index:
                 continue
-            res.append(obj)            
+            res.append(obj)
+            if limit and len(res) >= limit:
+                break
+        if limit:
+            res.reverse()
         return res
 
     @staticmethod
     def last(otp, selector=None, index=None, timed=None):
-        res =  sorted(Db.find(otp, selector, index, timed), key=lambda x: fntime(x.__fnm__))
+        res = Db.find(otp, selector, index, timed, limit=1)
         if res:
             return res[-1]
 
 
 def fnclass(path):
-    pth = []
-    try:
-        _rest, *pth = path.split("store")
-    except ValueError:
-        pass
-    if not pth:
-        pth = path.split(os.sep)
-    return pth[0]
+    "the type part of a type/uuid/day/time path, absolute or not."
+    pth = path.split(os.sep)
+    if len(pth) < 4:
+        return pth[0]
+    return pth[-4]
 
 
-def fns(otp, timed=None):
+def days(otp, timed=None):
+    """(day, object directory) of the newest date partition of every object
+       of type otp, partitions outside the timed range are skipped unread.
+    """
     if not otp:
         return []
-    assert Wd.workdir
-    p = os.path.join(Wd.workdir, "store", otp) + os.sep
+    tdir = os.path.join(Wd.get(), "store", otp)
+    if not os.path.exists(tdir):
+        return []
+    start, end = timerange(timed)
+    first = start and time.strftime("%Y-%m-%d", time.localtime(start))
+    final = end and time.strftime("%Y-%m-%d", time.localtime(end))
     res = []
-    d = ""
-    for rootdir, dirs, _files in os.walk(p, topdown=False):
-        if dirs:
-            d = sorted(dirs)[-1]
-            if d.count("-") == 2:
-                dd = os.path.join(rootdir, d)
-                fls = sorted(os.listdir(dd))
-                if fls:
-                    p = os.path.join(dd, fls[-1])
-                    if (
-                        timed
-                        and "from" in timed
-                        and timed["from"]
-                        and fntime(p) < timed["from"]
-                    ):
-                        continue
-                    if timed and timed.to and fntime(p) > timed.to:
-                        continue
-                    res.append(p)
-    return sorted(res, key=lambda x: fntime(x))
+    Slow.count("dirs")
+    for uid in os.listdir(tdir):
+        udir = os.path.join(tdir, uid)
+        Slow.count("dirs")
+        dys = [x for x in os.listdir(udir) if x.count("-") == 2]
+        if not dys:
+            continue
+        day = max(dys)
+        if first and day < first:
+            continue
+        if final and day > final:
+            continue
+        res.append((day, udir))
+    return res
+
+
+def fns(otp, timed=None):
+    with Query("fns", otp) as qry:
+        Slow.resolved([otp])
+        if Cache.enabled and not timed:
+            res = Cache.listings.get(otp)
+            if res is None:
+                gen = Cache.generation(otp)
+                res = listing(otp)
+                Cache.keep(otp, gen, res)
+            res = list(res)
+        else:
+            res = listing(otp, timed)
+        Metrics.inc("run_files_scanned_total", len(res))
+        qry.matches = len(res)
+        return res
+
+
+def listing(otp, timed=None):
+    start, end = timerange(timed)
+    res = []
+    for day, udir in days(otp, timed):
+        path = newestfile(os.path.join(udir, day), start, end)
+        if path:
+            res.append(path)
+    return sorted(res, key=fntime)
+
+
+def newest(otp, timed=None):
+    "yield the paths fns() returns, newest first, one day partition at a time."
+    start, end = timerange(timed)
+    parts = {}
+    for day, udir in days(otp, timed):
+        parts.setdefault(day, []).append(udir)
+    for day in sorted(parts, reverse=True):
+        res = []
+        for udir in parts[day]:
+            path = newestfile(os.path.join(udir, day), start, end)
+            if path:
+                res.append(path)
+        yield from sorted(res, key=fntime, reverse=True)
+
+
+def isnewest(fnm):
+    "fnm is the newest version of its object, no other process saved one since."
+    path = Wd.getpath(fnm)
+    ddir = os.path.dirname(path)
+    try:
+        if max(os.listdir(ddir)) != os.path.basename(path):
+            return False
+        return max(os.listdir(os.path.dirname(ddir))) == os.path.basename(ddir)
+    except (FileNotFoundError, ValueError):
+        return False
+
+
+def newestfile(ddir, start=None, end=None):
+    Slow.count("dirs")
+    fls = os.listdir(ddir)
+    if not fls:
+        return None
+    path = os.path.join(ddir, max(fls))
+    if start or end:
+        tme = fntime(path)
+        if start and tme < start:
+            return None
+        if end and tme > end:
+            return None
+    return path
+
 
 def fntime(daystr):
     daystr = daystr.replace("_", ":")
@@ -434,6 +820,45 @@ def fntime(daystr):
     return t
 
 
+def totime(txt, end=False):
+    "seconds since the epoch from a number or a (partial) date string."
+    if isinstance(txt, (int, float)):
+        return float(txt)
+    txt = str(txt).strip()
+    try:
+        return float(txt)
+    except ValueError:
+        pass
+    for fmt in (
+                "%Y-%m-%d %H:%M:%S",
+                "%Y-%m-%d_%H:%M:%S",
+                "%Y-%m-%dT%H:%M:%S",
+                "%Y-%m-%d %H:%M",
+                "%Y-%m-%dT%H:%M",
+               ):
+        try:
+            return time.mktime(time.strptime(txt, fmt))
+        except ValueError:
+            continue
+    tme = time.mktime(time.strptime(txt, "%Y-%m-%d"))
+    if end:
+        tme += 24 * 60 * 60
+    return tme
+
+
+def timerange(timed):
+    """(start, end) from a dict or object with optional from/to keys,
+       a date only to= includes that whole day.
+    """
+    if not timed:
+        return None, None
+    if isinstance(timed, dict):
+        start, end = timed.get("from"), timed.get("to")
+    else:
+        start, end = getattr(timed, "from", None), getattr(timed, "to", None)
+    return start and totime(start) or None, end and totime(end, True) or None
+
+
 def hook(path):
     cname = fnclass(path)
     cls = Class.get(cname)
@@ -445,15 +870,28 @@ def hook(path):
     return obj
 
 
-def find(otp, selector=None, index=None, timed=None, deleted=False):
+def find(otp, selector=None, index=None, timed=None, deleted=False, limit=None, keyz=None):
+    with Trace.span("find"), Query("find", otp, selector) as qry:
+        res = finding(otp, selector, index, timed, deleted, limit, keyz)
+        qry.matches = len(res)
+        return res
+
+
+def finding(otp, selector, index, timed, deleted, limit, keyz):
+    started = time.time()
     names = Class.full(otp)
     if not names:
         names = Wd.types(otp)
+    Slow.resolved(names)
     result = []
     for nme in names:
-        res = Db.find(nme, selector, index, timed, deleted)
+        res = Db.find(nme, selector, index, timed, deleted, limit, keyz)
         result.extend(res)
-    return sorted(result, key=lambda x: fntime(x.__fnm__))
+    result = sorted(result, key=lambda x: fntime(x.__fnm__))
+    Metrics.observe("run_find_seconds", time.time() - started)
+    if limit:
+        return result[-limit:]
+    return result
 
 
 def last(obj):
@@ -467,20 +905,47 @@ def match(otp, selector=None):
     if not names:
         names = Wd.types(otp)
     for nme in names:
-        for item in Db.last(nme, selector):
+        item = Db.last(nme, selector)
+        if item:
             return item
     return None
 
 
+def stream(otp, selector=None, timed=None, deleted=False, keyz=None):
+    """find() as a generator, objects are loaded one at a time as they get
+       consumed. The consumer times the reads, see Cursor.page().
+    """
+    names = Class.full(otp)
+    if not names:
+        names = Wd.types(otp)
+    paths = []
+    for nme in names:
+        paths.extend(fns(nme, timed))
+    if keyz:
+        keyz = set(keyz) | set(keys(selector or {})) | {"__deleted__"}
+    for path in sorted(paths, key=fntime):
+        obj = partial(path, keyz) if keyz else hook(path)
+        if deleted and "__deleted__" in obj and obj.__deleted__:
+            continue
+        if selector and not search(obj, selector):
+            continue
+        yield obj
+
+
 def search(obj, selector):
-    res = False
-    select = Object(selector)
-    for key, value in items(select):
-        val = getattr(obj, key)
-        if str(value) in str(val):
-            res = True
-            break
-    return res
+    "True when a value of selector is in obj's field, fields obj lacks count as empty."
+    for key, value in items(selector):
+        if str(value) in str(getattr(obj, key, "")):
+            return True
+    return False
+
+
+def selected(data, selector):
+    "search() on a decoded dict."
+    for key, value in items(selector):
+        if str(value) in str(data.get(key, "")):
+            return True
+    return False
 
 
 ## class whitelist
@@ -555,6 +1020,144 @@ class Wd:
         return res
 
 
+## watchers
+
+
+class Watch:
+
+    "functions called with (obj, path) after save() wrote a new version."
+
+    cbs = []
+
+    @staticmethod
+    def add(func):
+        if func not in Watch.cbs:
+            Watch.cbs.append(func)
+
+    @staticmethod
+    def fire(obj, path):
+        for func in list(Watch.cbs):
+            func(obj, path)
+
+    @staticmethod
+    def remove(func):
+        if func in Watch.cbs:
+            Watch.cbs.remove(func)
+
+
+## cache
+
+
+class Cache:
+
+    """Warm per-process cache of fns() listings and version file contents.
+       A listing goes stale as soon as any process saves, so the cache is
+       only switched on together with the journal that tells processes
+       about each other's saves (run.jrn.Journal.start). invalidate()
+       bumps a generation per type, a listing walked while a save landed
+       is not kept.
+    """
+
+    enabled = False
+    epoch = 0
+    generations = {}
+    listings = {}
+    lock = threading.Lock()
+    size = 10000
+    texts = {}
+
+    @staticmethod
+    def generation(otp):
+        with Cache.lock:
+            return (Cache.epoch, Cache.generations.get(otp, 0))
+
+    @staticmethod
+    def invalidate(otp=None):
+        with Cache.lock:
+            if otp is None:
+                Cache.epoch += 1
+                Cache.listings.clear()
+            else:
+                Cache.generations[otp] = Cache.generations.get(otp, 0) + 1
+                Cache.listings.pop(otp, None)
+
+    @staticmethod
+    def keep(otp, gen, res):
+        "store otp's listing, unless it was invalidated since gen."
+        with Cache.lock:
+            if (Cache.epoch, Cache.generations.get(otp, 0)) == gen:
+                Cache.listings[otp] = res
+
+    @staticmethod
+    def read(path):
+        txt = Cache.texts.get(path)
+        if txt is not None:
+            return txt
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as ifile:
+            txt = ifile.read()
+        with Cache.lock:
+            Cache.texts[path] = txt
+            if len(Cache.texts) > Cache.size:
+                Cache.texts.pop(next(iter(Cache.texts)))
+        return txt
+
+
+## content
+
+
+class Digest:
+
+    """Remembers the hash of the last payload saved per type/uuid prefix, so
+       saving an unchanged object doesn't write a new version. With cas set,
+       payloads are written once to Wd.workdir/cas and versions are hard
+       links to them.
+    """
+
+    cas = False
+    digests = {}
+    lock = threading.Lock()
+    size = 10000
+
+    @staticmethod
+    def casdir():
+        return os.path.join(Wd.get(), "cas", "")
+
+    @staticmethod
+    def digest(txt):
+        import hashlib
+        return hashlib.sha1(txt.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def link(digest, txt, opath):
+        cpath = os.path.join(Digest.casdir(), digest[:2], digest)
+        try:
+            if not os.path.exists(cpath):
+                cdir(cpath)
+                tmp = "%s.%s" % (cpath, os.getpid())
+                with open(tmp, "w", encoding="utf-8") as ofile:
+                    ofile.write(txt)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, cpath)
+            os.link(cpath, opath)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def set(prefix, digest):
+        with Digest.lock:
+            Digest.digests.pop(prefix, None)
+            Digest.digests[prefix] = digest
+            if len(Digest.digests) > Digest.size:
+                Digest.digests.pop(next(iter(Digest.digests)))
+
+    @staticmethod
+    def unchanged(prefix, digest):
+        return Digest.digests.get(prefix) == digest
+
+
 ## utility
 
 
@@ -563,7 +1166,7 @@ def cdir(path):
         return
     if not path.endswith(os.sep):
         path = os.path.dirname(path)
-    pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
     
 
 ## runtime
@@ -571,4 +1174,5 @@ def cdir(path):
 
 Class.add(Object)
 Class.add(Default)
+Class.add(Record)
  
\ No newline at end of file
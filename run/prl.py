@@ -0,0 +1,188 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"parallel find"
+
+
+## import
+
+
+import json
+import os
+import threading
+import time
+
+
+from .mtr import Metrics
+from .obj import Class, Codec, Db, Object, Wd, find, fnclass, fns, fntime, items, keys, project
+from .obj import revive, selected, update
+from .slw import Query, Slow
+from .trc import Trace
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Pool',
+            'pfind'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Pool:
+
+    "lazily started process pool, stores below threshold files are searched serially."
+
+    executor = None
+    lock = threading.Lock()
+    threshold = 1000
+    workdir = ""
+    workers = 0
+
+    @staticmethod
+    def drop():
+        "forget a broken executor, the next get() starts a fresh pool."
+        with Pool.lock:
+            if Pool.executor:
+                Pool.executor.shutdown(wait=False)
+            Pool.executor = None
+
+    @staticmethod
+    def get():
+        "the executor, workers start out with this process's Wd.workdir and journal."
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from .obj import Cache
+        with Pool.lock:
+            if Pool.executor and Pool.workdir != Wd.workdir:
+                Pool.executor.shutdown()
+                Pool.executor = None
+            if not Pool.executor:
+                Pool.workdir = Wd.workdir
+                Pool.executor = ProcessPoolExecutor(
+                    Pool.workers or os.cpu_count(),
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=setup,
+                    initargs=(Wd.workdir, Cache.enabled)
+                )
+            return Pool.executor
+
+    @staticmethod
+    def size():
+        return Pool.workers or os.cpu_count() or 1
+
+    @staticmethod
+    def stop():
+        with Pool.lock:
+            if Pool.executor:
+                Pool.executor.shutdown()
+            Pool.executor = None
+
+
+## worker
+
+
+def setup(workdir, journaled):
+    "runs once in every pool process, saves get journaled when the parent caches."
+    Wd.workdir = workdir
+    if journaled:
+        from .jrn import Journal
+        Journal.start(0)
+
+
+def decode(paths, selector, deleted, keyz=None):
+    """runs in the pool, returns (path, dict) for every file that matches.
+       Nested objects stay dicts, construct() revives them in the parent.
+    """
+    res = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as ifile:
+            if keyz:
+                data = project(ifile.read(), keyz, Codec.plain)
+            else:
+                data = json.load(ifile)
+        if deleted and data.get("__deleted__"):
+            continue
+        if selector and not selected(data, selector):
+            continue
+        res.append((path, data))
+    return res
+
+
+## utility
+
+
+def chunks(paths, nr):
+    size = max(1, len(paths) // nr)
+    return [paths[x:x+size] for x in range(0, len(paths), size)]
+
+
+def construct(path, data):
+    fnm = os.sep.join(path.split(os.sep)[-4:])
+    cls = Class.get(fnclass(fnm)) or Object
+    obj = cls()
+    update(obj, revive(data))
+    obj.__fnm__ = fnm
+    return obj
+
+
+def pfind(otp, selector=None, index=None, timed=None, deleted=False, limit=None, keyz=None):
+    """find() with json decoding and selection spread over a process pool,
+       results are merged in timestamp order. newest-N queries stop early
+       and stay serial.
+    """
+    if limit:
+        return find(otp, selector, index, timed, deleted, limit, keyz)
+    with Trace.span("pfind"), Query("pfind", otp, selector) as qry:
+        res = pfinding(otp, selector, index, timed, deleted, keyz)
+        qry.matches = len(res)
+        return res
+
+
+def pfinding(otp, selector, index, timed, deleted, keyz):
+    started = time.time()
+    names = Class.full(otp)
+    if not names:
+        names = Wd.types(otp)
+    Slow.resolved(names)
+    selector = dict(items(selector or {}))
+    if keyz:
+        keyz = sorted(set(keyz) | set(keys(selector)) | {"__deleted__"})
+    files = {nme: fns(nme, timed) for nme in names}
+    if sum([len(x) for x in files.values()]) < Pool.threshold:
+        result = []
+        for nme in names:
+            result.extend(Db.select(files[nme], selector, index, deleted, keyz=keyz))
+        Metrics.observe("run_find_seconds", time.time() - started)
+        return sorted(result, key=lambda x: fntime(x.__fnm__))
+    Slow.count("files", sum([len(x) for x in files.values()]))
+    from concurrent.futures.process import BrokenProcessPool
+    try:
+        executor = Pool.get()
+        futures = {
+                   nme: [
+                         executor.submit(decode, chunk, selector, deleted, keyz)
+                         for chunk in chunks(files[nme], Pool.size() * 4)
+                        ]
+                   for nme in names
+                  }
+        found = {nme: [x for future in futures[nme] for x in future.result()] for nme in names}
+    except BrokenProcessPool:
+        Pool.drop()
+        raise
+    result = []
+    for nme in names:
+        matches = found[nme]
+        if index is not None:
+            matches = matches[index:index+1]
+        result.extend([construct(path, data) for path, data in matches])
+    Metrics.observe("run_find_seconds", time.time() - started)
+    return sorted(result, key=lambda x: fntime(x.__fnm__))
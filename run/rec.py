@@ -0,0 +1,119 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"record/replay"
+
+
+## import
+
+
+import json
+import os
+import threading
+import time
+
+
+from .obj import Wd, cdir
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Recorder',
+            'read',
+            'replay'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Recorder:
+
+    """Appends one json line per handled event to a log in Wd.workdir/record:
+
+       [createtime, started, ended, orig, channel, txt]
+
+       txt is the line as typed, selectors and options included.
+    """
+
+    lock = threading.Lock()
+    ofile = None
+    path = ""
+
+    @staticmethod
+    def record(evt, started, ended):
+        line = json.dumps(
+                          [
+                           evt.createtime,
+                           started,
+                           ended,
+                           evt.orig,
+                           evt.channel,
+                           evt.otxt or evt.txt
+                          ],
+                          separators=(",", ":")
+                         )
+        with Recorder.lock:
+            if Recorder.ofile:
+                Recorder.ofile.write(line + "\n")
+
+    @staticmethod
+    def start(path=None):
+        if not path:
+            stamp = time.strftime("%Y-%m-%d_%H:%M:%S")
+            path = os.path.join(Wd.get(), "record", "%s.log" % stamp)
+        cdir(path)
+        with Recorder.lock:
+            Recorder.path = path
+            Recorder.ofile = open(path, "a", encoding="utf-8", buffering=1)
+        return path
+
+    @staticmethod
+    def stop():
+        with Recorder.lock:
+            if Recorder.ofile:
+                Recorder.ofile.close()
+            Recorder.ofile = None
+
+
+## utility
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as ifile:
+        for line in ifile:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(hdl, path, speed=1.0, event=None):
+    """put a recorded log back into hdl, speed is a multiplier on the
+       recorded pacing, 0 replays as fast as possible.
+    """
+    from .hdl import Event
+    events = []
+    base = None
+    start = time.time()
+    for createtime, _started, _ended, orig, channel, txt in read(path):
+        if base is None:
+            base = createtime
+        if speed:
+            delay = start + (createtime - base) / speed - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        evt = event and event() or Event()
+        evt.otxt = txt
+        evt.txt = txt
+        evt.channel = channel
+        evt.orig = repr(hdl)
+        evt.recorded = orig
+        hdl.put(evt)
+        events.append(evt)
+    return events
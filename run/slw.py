@@ -0,0 +1,182 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"slow queries"
+
+
+## import
+
+
+import json
+import os
+import threading
+import time
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Query',
+            'Slow',
+            'slw',
+            'worst'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Query:
+
+    """What one store query cost. Only the outermost query of a thread
+       counts, store calls it makes add to its numbers.
+    """
+
+    __slots__ = ("bytes", "dirs", "files", "matches", "op", "otp", "selector", "started", "top", "types")
+
+    def __init__(self, op, otp, selector=None):
+        self.bytes = 0
+        self.dirs = 0
+        self.files = 0
+        self.matches = 0
+        self.op = op
+        self.otp = otp
+        self.selector = selector
+        self.started = 0.0
+        self.top = False
+        self.types = []
+
+    def __enter__(self):
+        self.top = getattr(Slow.local, "query", None) is None
+        if self.top:
+            Slow.local.query = self
+        self.started = time.time()
+        return self
+
+    def __exit__(self, *args):
+        if not self.top:
+            return
+        Slow.local.query = None
+        elapsed = time.time() - self.started
+        if Slow.threshold and elapsed >= Slow.threshold:
+            Slow.log(self, elapsed)
+
+
+class Slow:
+
+    """Store queries that took threshold seconds or longer, one json line
+       each in Wd.workdir/slow.log, rotated to slow.log.1 at max bytes.
+       A threshold of 0 turns the log off.
+    """
+
+    local = threading.local()
+    lock = threading.Lock()
+    max = 1024 * 1024
+    threshold = 1.0
+
+    @staticmethod
+    def count(key, nr=1):
+        "add nr to key of the query the thread runs, if any."
+        qry = getattr(Slow.local, "query", None)
+        if qry is not None:
+            setattr(qry, key, getattr(qry, key) + nr)
+
+    @staticmethod
+    def log(qry, elapsed):
+        from .obj import items
+        line = json.dumps({
+                           "bytes": qry.bytes,
+                           "dirs": qry.dirs,
+                           "elapsed": elapsed,
+                           "files": qry.files,
+                           "matches": qry.matches,
+                           "op": qry.op,
+                           "otp": qry.otp,
+                           "selector": {x: str(y) for x, y in items(qry.selector or {})},
+                           "time": qry.started,
+                           "types": qry.types
+                          }, sort_keys=True)
+        Slow.write(line + "\n")
+
+    @staticmethod
+    def path():
+        from .obj import Wd
+        return os.path.join(Wd.get(), "slow.log")
+
+    @staticmethod
+    def read():
+        "the logged queries, the rotated file first."
+        path = Slow.path()
+        for fnm in (path + ".1", path):
+            if not os.path.exists(fnm):
+                continue
+            with open(fnm, "r", encoding="utf-8") as ifile:
+                for line in ifile:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    @staticmethod
+    def resolved(names):
+        "record the types the thread's query resolved to."
+        qry = getattr(Slow.local, "query", None)
+        if qry is not None and not qry.types:
+            qry.types = list(names)
+
+    @staticmethod
+    def write(line):
+        from .obj import cdir
+        path = Slow.path()
+        cdir(path)
+        with Slow.lock:
+            try:
+                if os.path.getsize(path) > Slow.max:
+                    os.replace(path, path + ".1")
+            except FileNotFoundError:
+                pass
+            with open(path, "a", encoding="utf-8") as ofile:
+                ofile.write(line)
+
+
+## utility
+
+
+def worst(records, top=10):
+    "group logged queries by op, type and selector keys, slowest first."
+    groups = {}
+    for rec in records:
+        key = (rec["op"], rec["otp"], ",".join(sorted(rec["selector"])))
+        grp = groups.setdefault(key, {"nr": 0, "max": 0.0, "total": 0.0, "files": 0})
+        grp["nr"] += 1
+        grp["max"] = max(grp["max"], rec["elapsed"])
+        grp["total"] += rec["elapsed"]
+        grp["files"] = max(grp["files"], rec["files"])
+    res = sorted(groups.items(), key=lambda x: x[1]["max"], reverse=True)
+    return res[:top]
+
+
+## command
+
+
+def slw(event):
+    res = worst(Slow.read(), int(event.sets.top or 10))
+    if not res:
+        event.reply("no slow queries (threshold %ss)" % Slow.threshold)
+        return
+    for (op, otp, keyz), grp in res:
+        event.reply("%s %s%s n=%s max=%.3fs avg=%.3fs files=%s" % (
+                                                                  op,
+                                                                  otp,
+                                                                  keyz and " %s" % keyz or "",
+                                                                  grp["nr"],
+                                                                  grp["max"],
+                                                                  grp["total"] / grp["nr"],
+                                                                  grp["files"]
+                                                                 ))
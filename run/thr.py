@@ -14,6 +14,9 @@ import time
 import types
 
 
+from .mtr import Metrics
+
+
 ## class
 
 
@@ -65,12 +68,16 @@ class Timer:
         self.state = {}
         self.timer = None
 
+    def fire(self, due):
+        Metrics.observe("run_timer_lag_seconds", time.time() - due)
+        self.run()
+
     def run(self):
         self.state["latest"] = time.time()
         launch(self.func, *self.args)
 
     def start(self):
-        timer = threading.Timer(self.sleep, self.run)
+        timer = threading.Timer(self.sleep, self.fire, (time.time() + self.sleep,))
         timer.name = self.name
         timer.daemon = True
         timer.sleep = self.sleep
@@ -100,6 +107,7 @@ class Repeater(Timer):
 
 def launch(func, *args, **kwargs):
     thrname = kwargs.get("name", name(func))
+    Metrics.inc("run_thread_launches_total")
     thr = Thread(func, thrname, *args)
     thr.start()
     return thr
@@ -118,3 +126,9 @@ def name(obj):
     if "__name__" in dir(obj):
         return obj.__name__
     return None
+
+
+## runtime
+
+
+Metrics.gauge("run_threads", threading.active_count, "live threads")
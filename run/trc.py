@@ -0,0 +1,156 @@
+# This file is placed in the Public Domain.
+# pylint: disable=R,C,W,C0302
+
+
+"tracing"
+
+
+## import
+
+
+import json
+import os
+import random
+import threading
+import time
+
+
+## define
+
+
+def __dir__():
+    return (
+            'Span',
+            'Trace'
+           )
+
+
+__all__ = __dir__()
+
+
+## class
+
+
+class Span:
+
+    "times one stage of the event the current thread works on."
+
+    __slots__ = ("name", "spans", "start")
+
+    def __init__(self, name, spans):
+        self.name = name
+        self.spans = spans
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.time()
+        Trace.local.depth += 1
+        return self
+
+    def __exit__(self, *args):
+        Trace.local.depth -= 1
+        self.spans.append((self.name, self.start, time.time() - self.start, Trace.local.depth))
+
+
+class Skip:
+
+    "the span handed out when nothing gets traced."
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class Trace:
+
+    """Opt-in event tracing. begin() gives an event a trace id and makes it
+       current for the thread, span() then times the stages it goes
+       through, store calls included, nested spans get a higher depth.
+       Events are kept at the sample rate, or always when they took at
+       least threshold seconds, and written as one json line each to
+       Wd.workdir/trace.jsonl.
+    """
+
+    enabled = False
+    local = threading.local()
+    lock = threading.Lock()
+    rate = 1.0
+    skip = Skip()
+    threshold = 0.0
+
+    @staticmethod
+    def begin(evt):
+        "start tracing evt in this thread, returns False when it is not sampled."
+        if not Trace.enabled:
+            return False
+        if not Trace.threshold and random.random() >= Trace.rate:
+            return False
+        evt._traceid = os.urandom(8).hex()
+        evt._spans = []
+        Trace.local.spans = evt._spans
+        Trace.local.depth = 0
+        return True
+
+    @staticmethod
+    def detach():
+        "the thread is done with its event, further spans go nowhere."
+        Trace.local.spans = None
+
+    @staticmethod
+    def finish(evt):
+        "write evt's trace when it is sampled or slow enough."
+        spans = getattr(evt, "_spans", None)
+        if not isinstance(spans, list):
+            return
+        total = time.time() - evt.createtime
+        if Trace.threshold:
+            if total < Trace.threshold and random.random() >= Trace.rate:
+                return
+        line = json.dumps({
+                           "trace": evt._traceid,
+                           "txt": evt.txt,
+                           "start": evt.createtime,
+                           "total": total,
+                           "spans": [
+                                     {
+                                      "name": nme,
+                                      "start": start,
+                                      "duration": duration,
+                                      "depth": depth
+                                     }
+                                     for nme, start, duration, depth in sorted(spans, key=lambda x: x[1])
+                                    ]
+                          })
+        with Trace.lock:
+            with open(Trace.path(), "a", encoding="utf-8") as ofile:
+                ofile.write(line + "\n")
+
+    @staticmethod
+    def path():
+        from .obj import Wd
+        return os.path.join(Wd.get(), "trace.jsonl")
+
+    @staticmethod
+    def span(name):
+        "a context manager that times name for the current event, if any."
+        spans = getattr(Trace.local, "spans", None)
+        if spans is None:
+            return Trace.skip
+        return Span(name, spans)
+
+    @staticmethod
+    def start(rate=1.0, threshold=0.0):
+        from .obj import cdir
+        cdir(Trace.path())
+        Trace.rate = rate
+        Trace.threshold = threshold
+        Trace.enabled = True
+
+    @staticmethod
+    def stop():
+        Trace.enabled = False
+        Trace.detach()
@@ -8,16 +8,35 @@
 ## import
 
 
-import getpass
 import os
-import pwd
 import sys
 import time
-import traceback
 import types
 
 
-from stat import ST_UID, ST_MODE, S_IMODE
+## class
+
+
+class Flock:
+
+    "exclusive (or shared) fcntl lock on a file, for use as a context manager."
+
+    def __init__(self, path, shared=False):
+        self.fd = None
+        self.path = path
+        self.shared = shared
+
+    def __enter__(self):
+        import fcntl
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        import fcntl
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
 
 
 ## utility
@@ -66,6 +85,17 @@ def elapsed(seconds, short=True):
     return txt
 
 
+def from_exception(exc, txt="", sep=" "):
+    import traceback
+    result = []
+    for frm in traceback.extract_tb(exc.__traceback__):
+        fnm = os.sep.join(frm.filename.split(os.sep)[-2:])
+        result.append(f"{fnm}:{frm.lineno}")
+    nme = name(exc)
+    res = sep.join(result)
+    return f"{txt} {res} {nme}: {exc}"
+
+
 def filesize(path):
     return os.stat(path)[6]
 
@@ -112,6 +142,8 @@ def name(obj):
 
 
 def permission(ddir, username=None, group=None, umode=0o700):
+    import pwd
+    from stat import ST_UID, ST_MODE, S_IMODE
     username = username or sys.argv[0]
     group = group or username
     try:
@@ -129,6 +161,25 @@ def permission(ddir, username=None, group=None, umode=0o700):
     return True
 
 
+def site(exc):
+    """file:line and type of the frame that raised exc, for exceptions
+       from a process pool the frame in the pool process.
+    """
+    cause = exc.__cause__
+    if type(cause).__name__ == "_RemoteTraceback":
+        import re
+        frames = re.findall(r'File "([^"]+)", line (\d+)', cause.tb)
+        if frames:
+            fnm, lineno = frames[-1]
+            return "%s:%s %s" % (os.sep.join(fnm.split(os.sep)[-2:]), lineno, name(exc))
+    import traceback
+    frames = traceback.extract_tb(exc.__traceback__)
+    if not frames:
+        return name(exc)
+    frm = frames[-1]
+    return "%s:%s %s" % (os.sep.join(frm.filename.split(os.sep)[-2:]), frm.lineno, name(exc))
+
+
 def spl(txt):
     try:
         res = txt.split(",")
@@ -143,6 +194,7 @@ def touch(fname):
 
 
 def user():
+    import getpass
     try:
         return getpass.getuser() 
     except ImportError:
@@ -0,0 +1,52 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"aggregation"
+
+
+from run import scan
+from run.agg import aggregate
+from run.hdl import Command, Event
+from run.obj import Class, Object, save
+
+
+from wdr import Workdir
+
+
+class Task(Object):
+
+    pass
+
+
+Class.add(Task)
+
+
+class TestAggregate(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        for user, prio in (("bart", 1), ("bart", 3), ("jan", 2)):
+            obj = Task()
+            obj.user = user
+            obj.prio = prio
+            save(obj)
+
+    def test_count(self):
+        self.assertEqual(aggregate("task", "count", by="user"), {"bart": 2, "jan": 1})
+
+    def test_max(self):
+        self.assertEqual(aggregate("task", "max", "prio", "user"), {"bart": 3.0, "jan": 2.0})
+
+    def test_last(self):
+        self.assertEqual(aggregate("task", "last", "user"), {"": "jan"})
+
+    def test_fnd(self):
+        import run.fnd
+        scan(run.fnd)
+        self.assertIsNone(Command.get("agg"))
+        self.assertIsNone(Command.get("aggregated"))
+        evt = Event()
+        evt.parse("fnd task count by=user")
+        run.fnd.fnd(evt)
+        self.assertEqual(evt.result, ["bart 2", "jan 1"])
@@ -0,0 +1,57 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"batch"
+
+
+import time
+
+
+from run.bat import Batch
+from run.hdl import Command
+
+
+from wdr import Workdir
+
+
+def bat(event):
+    time.sleep(float(event.args[0]))
+    event.reply(event.args[0])
+
+
+def bok(event):
+    event.ok()
+
+
+class TestBatch(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Command.add(bat)
+        Command.add(bok)
+
+    def tearDown(self):
+        Command.remove("bat")
+        Command.remove("bok")
+        Workdir.tearDown(self)
+
+    def run_batch(self, lines, jobs):
+        res = []
+        bch = Batch(jobs, res.append, window=2)
+        bch.start()
+        try:
+            nr = bch.run(lines)
+        finally:
+            bch.stop()
+        return nr, res
+
+    def test_order(self):
+        lines = ["bat 0.2", "# skipped", "", "bat 0.0", "bat 0.1", "bat 0.0"]
+        nr, res = self.run_batch(lines, 4)
+        self.assertEqual(nr, 4)
+        self.assertEqual(res, ["0.2", "0.0", "0.1", "0.0"])
+
+    def test_ok(self):
+        _nr, res = self.run_batch(["bok"], 1)
+        self.assertTrue(res[0].startswith("ok"))
@@ -0,0 +1,84 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"callbacks"
+
+
+import threading
+
+
+from run.hdl import Callback, Event, compiled
+
+
+from wdr import Workdir
+
+
+def event(txt, channel="", orig=""):
+    evt = Event()
+    evt.txt = txt
+    evt.channel = channel
+    evt.orig = orig
+    evt.type = "msg"
+    return evt
+
+
+class TestCallback(Workdir):
+
+    def test_multiple(self):
+        res = []
+        cbk = Callback()
+        cbk.register("msg", lambda evt: res.append("a"))
+        cbk.register("msg", lambda evt: res.append("b"))
+        cbk.callback(event("hello"))
+        self.assertEqual(res, ["a", "b"])
+
+    def test_filters(self):
+        res = []
+        cbk = Callback()
+        cbk.register("msg", lambda evt: res.append("chan"), channel="#run")
+        cbk.register("msg", lambda evt: res.append("orig"), orig=["bot1", "bot2"])
+        cbk.register("msg", lambda evt: res.append("cmd"), prefix="fnd")
+        cbk.callback(event("fnd log", "#other", "bot2"))
+        self.assertEqual(res, ["orig", "cmd"])
+        evt = event("log", "#other", "bot3")
+        cbk.callback(evt)
+        self.assertEqual(res, ["orig", "cmd"])
+        self.assertTrue(evt.__ready__.is_set())
+
+    def test_compiled(self):
+        self.assertTrue(compiled() is None)
+        pred = compiled(channel="#run", prefix=("fnd", "log"))
+        self.assertTrue(pred(event("log x", "#run")))
+        self.assertFalse(pred(event("log x", "#ops")))
+        self.assertFalse(pred(event("cmd", "#run")))
+
+    def test_once(self):
+        res = []
+
+        def func(evt):
+            res.append(evt.txt)
+
+        cbk = Callback()
+        cbk.register("msg", func)
+        cbk.register("msg", func)
+        cbk.callback(event("one"))
+        self.assertEqual(res, ["one"])
+        cbk.unregister("msg", func)
+        self.assertEqual(cbk.get("msg"), [])
+
+    def test_private(self):
+        one = Callback()
+        two = Callback()
+        one.register("msg", print)
+        self.assertEqual(two.get("msg"), [])
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(2, timeout=5.0)
+        cbk = Callback()
+        cbk.concurrent = True
+        cbk.register("msg", lambda evt: barrier.wait())
+        cbk.register("msg", lambda evt: barrier.wait())
+        evt = event("both")
+        cbk.callback(evt)
+        self.assertFalse(evt._exc)
@@ -0,0 +1,69 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"codec"
+
+
+from run.obj import Class, Default, Object, dumps, find, loads, save
+
+
+from wdr import Workdir
+
+
+class Inner(Object):
+
+    pass
+
+
+class Outer(Object):
+
+    def __init__(self):
+        Object.__init__(self)
+        self.inner = Inner()
+        self.tags = set()
+
+
+Class.add(Inner)
+Class.add(Outer)
+
+
+class TestCodec(Workdir):
+
+    def test_nested(self):
+        obj = Outer()
+        obj.inner.txt = "hello"
+        res = loads(dumps({"list": [obj]}))
+        self.assertEqual(type(res.list[0]), Outer)
+        self.assertEqual(type(res.list[0].inner), Inner)
+        self.assertEqual(res.list[0].inner.txt, "hello")
+
+    def test_fnm(self):
+        obj = Object()
+        obj.inner = Inner()
+        obj.opts = Default()
+        res = loads(dumps(obj))
+        self.assertEqual(type(res.inner), Inner)
+        self.assertEqual(res.opts.verbose, "")
+        fnm = res.inner.__fnm__
+        self.assertTrue(fnm.startswith("test_cdc.Inner"))
+        self.assertEqual(res.inner.__fnm__, fnm)
+        self.assertRaises(AttributeError, getattr, res.inner, "missing")
+
+    def test_set(self):
+        obj = Outer()
+        obj.tags = {"a"}
+        self.assertEqual(loads(dumps(obj)).tags, ["a"])
+
+    def test_unknown(self):
+        res = loads('{"sub": {"__kind__": "nope.Nope", "a": 1}}')
+        self.assertEqual(type(res.sub), Object)
+        self.assertEqual(res.sub.a, 1)
+
+    def test_store(self):
+        obj = Outer()
+        obj.inner.txt = "stored"
+        save(obj)
+        res = find("outer")[-1]
+        self.assertEqual(type(res.inner), Inner)
+        self.assertEqual(res.inner.txt, "stored")
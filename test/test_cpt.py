@@ -0,0 +1,59 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"compaction"
+
+
+import os
+
+
+from run.cpt import compact, resolve, versions
+from run.obj import Object, Wd, find, save
+
+
+from wdr import Workdir
+
+
+class Compact(Object):
+
+    pass
+
+
+class Catalog(Object):
+
+    pass
+
+
+class Log(Object):
+
+    pass
+
+
+class TestCompact(Workdir):
+
+    def test_compact(self):
+        obj = Compact()
+        for nr in range(3):
+            obj.txt = "version %s" % nr
+            save(obj)
+        udir = os.path.dirname(os.path.dirname(Wd.getpath(obj.__fnm__)))
+        self.assertEqual(len(versions(udir)), 3)
+        compact("compact", keep=2)
+        self.assertEqual(len(versions(udir)), 2)
+        compact("compact")
+        self.assertEqual(len(versions(udir)), 1)
+        self.assertEqual(find("compact")[-1].txt, "version 2")
+        self.assertTrue(os.path.exists(os.path.join(Wd.workdir, "archive", "test_cpt.Compact.jsonl")))
+
+    def test_exact(self):
+        cat = Catalog()
+        log = Log()
+        for nr in range(2):
+            cat.txt = log.txt = "version %s" % nr
+            save(cat)
+            save(log)
+        self.assertNotIn("test_cpt.Catalog", resolve("log"))
+        compact("log")
+        udir = os.path.dirname(os.path.dirname(Wd.getpath(cat.__fnm__)))
+        self.assertEqual(len(versions(udir)), 2)
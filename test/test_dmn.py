@@ -0,0 +1,63 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"daemon"
+
+
+import os
+import socket
+import stat
+import threading
+
+
+from run.dmn import Daemon
+from run.hdl import Command
+
+
+from wdr import Workdir
+
+
+def dmn(event):
+    event.reply("first")
+    event.reply("second %s" % event.rest)
+
+
+def request(txt):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(Daemon.path())
+        sock.sendall((txt + "\n").encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        res = b""
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                break
+            res += data
+    return res.decode("utf-8").splitlines()
+
+
+class TestDaemon(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Command.add(dmn)
+        Daemon.start()
+        self.thr = threading.Thread(target=Daemon.serve, daemon=True)
+        self.thr.start()
+
+    def tearDown(self):
+        Daemon.stop()
+        self.thr.join(5.0)
+        Command.remove("dmn")
+        Workdir.tearDown(self)
+
+    def test_reply(self):
+        self.assertEqual(request("dmn arg"), ["first", "second arg"])
+
+    def test_mode(self):
+        self.assertEqual(stat.S_IMODE(os.stat(Daemon.path()).st_mode), 0o600)
+
+    def test_alive(self):
+        self.assertTrue(Daemon.alive())
+        self.assertRaises(RuntimeError, Daemon.start)
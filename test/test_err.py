@@ -0,0 +1,91 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"errors"
+
+
+import concurrent.futures
+
+
+from run.err import Errors, err
+from run.hdl import Event
+
+
+from wdr import Workdir
+
+
+def boo(event):
+    raise ValueError("boo %s" % event.rest)
+
+
+def bad(nr):
+    raise ValueError("bad %s" % nr)
+
+
+def worse(nr):
+    raise KeyError(nr)
+
+
+class TestErrors(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Errors.clear()
+
+    def tearDown(self):
+        Errors.clear()
+        Workdir.tearDown(self)
+
+    def test_dedupe(self):
+        for _nr in range(3):
+            try:
+                boo(Event())
+            except ValueError as ex:
+                Errors.add(ex)
+        res = Errors.summary()
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0][1], 3)
+        self.assertEqual(len(Errors.ring), 3)
+
+    def test_bounded(self):
+        for nr in range(Errors.max * 2):
+            Errors.add(ValueError(nr))
+        self.assertEqual(len(Errors.ring), Errors.max)
+        self.assertTrue("199" in Errors.ring[-1][2])
+
+    def test_command(self):
+        try:
+            boo(Event())
+        except ValueError as ex:
+            txt = Errors.add(ex)
+        evt = Event()
+        evt.parse("err")
+        err(evt)
+        self.assertTrue(evt.result[0].startswith("1x "))
+        self.assertTrue(txt in evt.result[0])
+        evt = Event()
+        evt.parse("err -c")
+        err(evt)
+        self.assertEqual(Errors.summary(), [])
+
+    def test_recent(self):
+        for nr in range(3):
+            Errors.add(ValueError("nr %s" % nr))
+        evt = Event()
+        evt.parse("err recent top=2")
+        err(evt)
+        self.assertEqual(len(evt.result), 2)
+        self.assertTrue(evt.result[0].endswith("nr 2"))
+        self.assertTrue(evt.result[1].endswith("nr 1"))
+
+    def test_remote(self):
+        with concurrent.futures.ProcessPoolExecutor(1) as pool:
+            for func in (bad, worse):
+                try:
+                    pool.submit(func, 1).result()
+                except (KeyError, ValueError) as ex:
+                    Errors.add(ex)
+        sites = [x[0] for x in Errors.summary()]
+        self.assertEqual(len(sites), 2)
+        self.assertTrue(all(x.startswith("test/test_err.py:") for x in sites))
@@ -0,0 +1,42 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"columnar export"
+
+
+import math
+
+
+from run.exp import columns, export
+from run.obj import Object, save
+
+
+from wdr import Workdir
+
+
+class Sample(Object):
+
+    pass
+
+
+class TestExport(Workdir):
+
+    def test_export(self):
+        for nr in range(3):
+            obj = Sample()
+            obj.nr = nr
+            obj.txt = "sample %s" % nr
+            save(obj)
+        self.assertEqual(export("test_exp.Sample", False), 3)
+        cols = columns("test_exp.Sample")
+        self.assertEqual(list(cols["nr"]), [0.0, 1.0, 2.0])
+        self.assertEqual(cols["txt"][-1], "sample 2")
+        obj = Sample()
+        obj.extra = "new field"
+        save(obj)
+        self.assertEqual(export("test_exp.Sample"), 1)
+        cols = columns("test_exp.Sample")
+        self.assertEqual(len(cols["txt"]), 4)
+        self.assertTrue(math.isnan(cols["nr"][-1]))
+        self.assertEqual(cols["extra"], ["", "", "", "new field"])
@@ -0,0 +1,44 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"change feed"
+
+
+from run.fed import Feed
+from run.hdl import Handler
+from run.obj import Object, save
+
+
+from wdr import Workdir
+
+
+class Note(Object):
+
+    pass
+
+
+class Quiet(Handler):
+
+    def raw(self, txt):
+        pass
+
+
+class TestFeed(Workdir):
+
+    def test_subscribe(self):
+        got = []
+        hdl = Quiet()
+        sub = Feed.subscribe(hdl, got.append, "note", {"txt": "wanted"})
+        try:
+            for txt in ("skipped", "wanted"):
+                obj = Note()
+                obj.txt = txt
+                save(obj)
+            save(Object())
+        finally:
+            Feed.unsubscribe(sub)
+        while not hdl.queue.empty():
+            hdl.handle(hdl.queue.get_nowait())
+        self.assertEqual([x.obj.txt for x in got], ["wanted"])
+        self.assertTrue(got[0].path.endswith(got[0].obj.__fnm__))
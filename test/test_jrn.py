@@ -0,0 +1,94 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"journal"
+
+
+import os
+import subprocess
+import sys
+import threading
+
+
+import run.obj
+
+
+from run.jrn import Journal
+from run.obj import Cache, Class, Object, Wd, find, save
+
+
+from wdr import Workdir
+
+
+REMOTE = """
+import sys
+from run.jrn import Journal
+from run.obj import Object, Wd, save
+Wd.workdir = sys.argv[1]
+class Shared(Object):
+    pass
+Shared.__module__ = "test_jrn"
+Journal.start(0)
+obj = Shared()
+obj.txt = "remote"
+save(obj)
+"""
+
+
+class Shared(Object):
+
+    pass
+
+
+Class.add(Shared)
+
+
+class TestJournal(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Journal.start(0)
+
+    def tearDown(self):
+        Journal.stop()
+        Workdir.tearDown(self)
+
+    def test_local(self):
+        obj = Shared()
+        obj.txt = "local"
+        save(obj)
+        self.assertTrue(Cache.enabled)
+        self.assertIn("local", [x.txt for x in find("shared")])
+
+    def test_remote(self):
+        find("shared")
+        self.assertIn("test_jrn.Shared", Cache.listings)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        subprocess.run([sys.executable, "-c", REMOTE, Wd.workdir], env=env, check=True)
+        self.assertEqual(Journal.poll(), 1)
+        self.assertNotIn("test_jrn.Shared", Cache.listings)
+        self.assertIn("remote", [x.txt for x in find("shared")])
+
+    def test_race(self):
+        first = Shared()
+        first.txt = "first"
+        save(first)
+        walk = run.obj.listing
+
+        def stale(otp, timed=None):
+            res = walk(otp, timed)
+            obj = Shared()
+            obj.txt = "second"
+            thr = threading.Thread(target=save, args=(obj,))
+            thr.start()
+            thr.join()
+            return res
+
+        run.obj.listing = stale
+        try:
+            find("shared")
+        finally:
+            run.obj.listing = walk
+        self.assertIn("second", [x.txt for x in find("shared")])
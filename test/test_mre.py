@@ -0,0 +1,87 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"pagination"
+
+
+from run.hdl import Event
+from run.mre import Cursor, mre
+
+
+from wdr import Workdir
+
+
+def consumed(rows):
+    for nr in rows:
+        consumed.nr = nr
+        yield str(nr)
+
+
+class TestCursor(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Cursor.size = 2
+
+    def tearDown(self):
+        Cursor.size = 0
+        Cursor.cursors.clear()
+        Cursor.last.clear()
+        Workdir.tearDown(self)
+
+    def test_pages(self):
+        evt = Event()
+        self.assertEqual(Cursor.page(evt, consumed(range(5))), 2)
+        self.assertEqual(evt.result[:2], ["0", "1"])
+        self.assertTrue(evt.result[2].startswith("use mre "))
+        self.assertEqual(consumed.nr, 2)
+        evt = Event()
+        mre(evt)
+        self.assertEqual(evt.result[:2], ["2", "3"])
+        evt = Event()
+        mre(evt)
+        self.assertEqual(evt.result, ["4"])
+        evt = Event()
+        mre(evt)
+        self.assertEqual(evt.result, ["no more results"])
+
+    def test_clients(self):
+        one = Event()
+        one.orig = "one"
+        Cursor.page(one, range(5))
+        token = one.result[-1].split()[2]
+        two = Event()
+        two.orig = "two"
+        Cursor.page(two, range(10, 15))
+        evt = Event()
+        evt.orig = "one"
+        mre(evt)
+        self.assertEqual(evt.result[:2], [2, 3])
+        evt = Event()
+        evt.orig = "other"
+        evt.parse("mre %s" % token)
+        mre(evt)
+        self.assertEqual(evt.result, [4])
+        evt = Event()
+        evt.orig = "other"
+        mre(evt)
+        self.assertEqual(evt.result, ["no more results"])
+
+    def test_evict(self):
+        Cursor.page(Event(), range(5))
+        idle = Cursor.idle
+        Cursor.idle = -1
+        try:
+            evt = Event()
+            mre(evt)
+        finally:
+            Cursor.idle = idle
+        self.assertEqual(evt.result, ["no more results"])
+
+    def test_unpaged(self):
+        Cursor.size = 0
+        evt = Event()
+        Cursor.page(evt, range(5))
+        self.assertEqual(len(evt.result), 5)
+        self.assertFalse(Cursor.cursors)
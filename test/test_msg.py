@@ -0,0 +1,86 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"slotted event"
+
+
+import os
+import threading
+
+
+from run import command
+from run.hdl import Command, Handler, Msg
+from run.obj import Wd
+from run.rec import Recorder, replay
+
+
+from wdr import Workdir
+
+
+def msg(event):
+    event.reply("%s %s" % (event.rest, event.sets.key))
+
+
+class Quiet(Handler):
+
+    def raw(self, txt):
+        pass
+
+
+class TestMsg(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Command.add(msg)
+
+    def tearDown(self):
+        Command.remove("msg")
+        Msg.pool.clear()
+        Workdir.tearDown(self)
+
+    def test_lazy(self):
+        evt = Msg("msg arg")
+        evt.parse()
+        self.assertEqual(evt.args, ["arg"])
+        self.assertTrue(evt._sets is None)
+        self.assertTrue(evt._ready is None)
+        self.assertFalse(hasattr(evt, "__dict__"))
+
+    def test_command(self):
+        evt = command(Quiet(), "msg arg key=value", Msg)
+        evt.wait()
+        self.assertEqual(evt.result, ["arg value"])
+        self.assertTrue(evt._ready is None)
+
+    def test_wait(self):
+        evt = Msg()
+        thr = threading.Timer(0.05, evt.ready)
+        thr.start()
+        self.assertTrue(evt.wait(5.0))
+        self.assertFalse(Msg().wait(0.01))
+
+    def test_pool(self):
+        evt = Msg.get("msg one")
+        evt.reply("shown")
+        evt.release()
+        res = Msg.get("msg two")
+        self.assertTrue(res is evt)
+        self.assertEqual(res.result, [])
+        self.assertEqual(res.txt, "msg two")
+
+    def test_dropin(self):
+        evt = Msg("msg")
+        self.assertEqual(evt.console, "")
+        self.assertEqual(evt.unknown, "")
+        path = Recorder.start(os.path.join(Wd.workdir, "record", "msg.log"))
+        Command.handle(Msg("msg arg key=value"))
+        Recorder.stop()
+        hdl = Quiet()
+        hdl.start()
+        events = replay(hdl, path, 0, Msg)
+        for evt in events:
+            evt.wait()
+        hdl.stop()
+        self.assertEqual(events[-1].recorded, "")
+        self.assertEqual(events[-1].result, ["arg value"])
@@ -0,0 +1,51 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"metrics"
+
+
+import os
+import urllib.request
+
+
+from run.mtr import Metrics
+from run.obj import Object, save
+
+
+from wdr import Workdir
+
+
+class TestMetrics(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Metrics.reset()
+
+    def test_text(self):
+        Metrics.inc("test_total", 2)
+        Metrics.observe("test_seconds", 0.5)
+        txt = Metrics.text()
+        self.assertTrue("# TYPE test_total counter\ntest_total 2\n" in txt)
+        self.assertTrue("test_seconds_sum 0.5\ntest_seconds_count 1\n" in txt)
+        self.assertTrue("# TYPE run_threads gauge" in txt)
+
+    def test_save(self):
+        obj = Object()
+        obj.txt = "counted"
+        save(obj)
+        self.assertEqual(Metrics.counters["run_saves_total"], 1)
+        self.assertTrue(Metrics.counters["run_bytes_written_total"] > 0)
+
+    def test_export(self):
+        Metrics.inc("test_total")
+        Metrics.write()
+        with open(Metrics.path(), "r", encoding="utf-8") as ifile:
+            self.assertTrue("test_total 1" in ifile.read())
+        port = Metrics.serve(0)
+        try:
+            with urllib.request.urlopen("http://127.0.0.1:%s/metrics" % port) as res:
+                self.assertTrue("test_total 1" in res.read().decode("utf-8"))
+        finally:
+            Metrics.stop()
+        self.assertFalse(os.path.exists(Metrics.path() + ".tmp"))
@@ -0,0 +1,116 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"process commands"
+
+
+import os
+
+
+from run.hdl import Command, Event, Handler
+from run.jrn import Journal
+from run.obj import Class, Object, find, save
+from run.prl import Pool
+
+
+from wdr import Workdir
+
+
+class Quiet(Handler):
+
+    def __init__(self):
+        Handler.__init__(self)
+        self.lines = []
+
+    def raw(self, txt):
+        self.lines.append(txt)
+
+
+def heavy(event):
+    event.reply("%s %s" % (event.rest, sum(range(1000))))
+
+
+heavy.process = True
+
+
+class Saved(Object):
+
+    pass
+
+
+Class.add(Saved)
+
+
+def saver(event):
+    obj = Saved()
+    obj.txt = event.rest
+    save(obj)
+    event.reply("saved")
+
+
+saver.process = True
+
+
+def crash(event):
+    os._exit(1)
+
+
+crash.process = True
+
+
+class TestProcess(Workdir):
+
+    def test_process(self):
+        Command.add(heavy)
+        self.assertIn("heavy", Command.procs)
+        hdl = Quiet()
+        evt = Event()
+        evt.orig = repr(hdl)
+        evt.txt = "heavy sum"
+        try:
+            Command.handle(evt)
+            evt.wait()
+        finally:
+            Command.remove("heavy")
+            Pool.stop()
+        self.assertEqual(hdl.lines, ["sum 499500"])
+
+    def test_journaled(self):
+        Journal.start(0)
+        Command.add(saver)
+        try:
+            obj = Saved()
+            obj.txt = "local"
+            save(obj)
+            self.assertEqual([x.txt for x in find("saved")], ["local"])
+            evt = Event()
+            evt.txt = "saver remote"
+            Command.handle(evt)
+            evt.wait()
+            self.assertEqual(evt.result, ["saved"])
+            Journal.poll()
+            self.assertEqual([x.txt for x in find("saved")], ["local", "remote"])
+        finally:
+            Command.remove("saver")
+            Pool.stop()
+            Journal.stop()
+
+    def test_broken(self):
+        Command.add(crash)
+        Command.add(heavy)
+        try:
+            evt = Event()
+            evt.txt = "crash"
+            Command.handle(evt)
+            evt.wait()
+            self.assertTrue(evt._exc)
+            evt = Event()
+            evt.txt = "heavy again"
+            Command.handle(evt)
+            evt.wait()
+        finally:
+            Command.remove("crash")
+            Command.remove("heavy")
+            Pool.stop()
+        self.assertEqual(evt.result, ["again 499500"])
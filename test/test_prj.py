@@ -0,0 +1,45 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"projection"
+
+
+from run.obj import Class, Object, dumps, find, project, save
+
+
+from wdr import Workdir
+
+
+class Wide(Object):
+
+    pass
+
+
+Class.add(Wide)
+
+
+class TestProjection(Workdir):
+
+    def test_project(self):
+        txt = dumps({
+                     "blob": 'x"}]\\' * 100,
+                     "nested": {"a": [1, {"b": "}"}]},
+                     "nr": 1.5,
+                     "txt": "hello"
+                    })
+        self.assertEqual(project(txt, ["txt", "nr"]), {"nr": 1.5, "txt": "hello"})
+        self.assertEqual(project(txt, ["nested"])["nested"], {"a": [1, {"b": "}"}]})
+
+    def test_missing(self):
+        self.assertEqual(project('{"a": 1}', ["b"]), {})
+
+    def test_find(self):
+        obj = Wide()
+        obj.blob = "z" * 10000
+        obj.txt = "projected"
+        save(obj)
+        res = find("wide", {"txt": "projected"}, keyz=["txt"])[-1]
+        self.assertEqual(type(res), Wide)
+        self.assertEqual(res.txt, "projected")
+        self.assertFalse("blob" in res)
@@ -0,0 +1,119 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"parallel find"
+
+
+import os
+
+
+from concurrent.futures.process import BrokenProcessPool
+
+
+import run.obj
+
+
+from run.obj import Class, Default, Object, find, save
+from run.prl import Pool, pfind
+
+
+from wdr import Workdir
+
+
+class Parallel(Object):
+
+    pass
+
+
+class Holder(Object):
+
+    pass
+
+
+Class.add(Holder)
+Class.add(Parallel)
+
+
+class TestParallel(Workdir):
+
+    def test_pfind(self):
+        for nr in range(10):
+            obj = Parallel()
+            obj.txt = "parallel %s" % nr
+            save(obj)
+        threshold = Pool.threshold
+        Pool.threshold = 0
+        try:
+            res = pfind("parallel", {"txt": "parallel 3"})
+            self.assertEqual([x.txt for x in res], [x.txt for x in find("parallel", {"txt": "parallel 3"})])
+            self.assertEqual(type(res[0]), Parallel)
+            self.assertEqual(len(pfind("parallel")), len(find("parallel")))
+        finally:
+            Pool.threshold = threshold
+            Pool.stop()
+
+    def test_serial(self):
+        obj = Parallel()
+        obj.txt = "serial"
+        save(obj)
+        walk = run.obj.listing
+        walks = []
+
+        def counted(otp, timed=None):
+            walks.append(otp)
+            return walk(otp, timed)
+
+        run.obj.listing = counted
+        try:
+            res = pfind("parallel", {"txt": "serial"})
+        finally:
+            run.obj.listing = walk
+        self.assertEqual(len(res), 1)
+        self.assertEqual(walks, ["test_prl.Parallel"])
+
+    def test_nested(self):
+        for nr in range(5):
+            obj = Holder()
+            obj.opts = Default()
+            obj.opts.nr = nr
+            obj.txt = "holder %s" % nr
+            save(obj)
+        threshold = Pool.threshold
+        Pool.threshold = 1
+        try:
+            res = pfind("holder", keyz=["opts"])
+        finally:
+            Pool.threshold = threshold
+            Pool.stop()
+        self.assertEqual([x.opts.nr for x in res], list(range(5)))
+        self.assertEqual(type(res[0].opts), Default)
+        self.assertEqual(res[0].opts.missing, "")
+
+    def test_broken(self):
+        obj = Parallel()
+        obj.txt = "broken"
+        save(obj)
+        threshold = Pool.threshold
+        Pool.threshold = 0
+        try:
+            future = Pool.get().submit(os._exit, 1)
+            self.assertRaises(BrokenProcessPool, future.result)
+            self.assertRaises(BrokenProcessPool, pfind, "parallel")
+            self.assertEqual([x.txt for x in pfind("parallel")], ["broken"])
+        finally:
+            Pool.threshold = threshold
+            Pool.stop()
+
+    def test_missing(self):
+        obj = Parallel()
+        obj.txt = "missing"
+        save(obj)
+        self.assertEqual(find("parallel", {"foo": "x"}), [])
+        threshold = Pool.threshold
+        Pool.threshold = 0
+        try:
+            self.assertEqual(pfind("parallel", {"foo": "x"}), [])
+        finally:
+            Pool.threshold = threshold
+            Pool.stop()
@@ -0,0 +1,45 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"records"
+
+
+from run.obj import Class, Record, dumps, fields, find, items, save, update
+
+
+from wdr import Workdir
+
+
+class Entry(Record):
+
+    __slots__ = ("txt", "nick")
+
+
+Class.add(Entry)
+
+
+class TestRecord(Workdir):
+
+    def test_fields(self):
+        self.assertEqual(fields(Entry), ("txt", "nick"))
+        self.assertFalse(hasattr(Entry(), "__dict__"))
+
+    def test_update(self):
+        rec = Entry()
+        update(rec, {"txt": "hello", "unknown": "skipped"})
+        self.assertEqual(dict(items(rec)), {"txt": "hello", "nick": ""})
+
+    def test_json(self):
+        rec = Entry(txt="hello")
+        self.assertEqual(
+                         dumps({"rec": rec}),
+                         '{"rec": {"txt": "hello", "nick": "", "__kind__": "test_rcd.Entry"}}'
+                        )
+
+    def test_hook(self):
+        rec = Entry(txt="stored", nick="bart")
+        save(rec)
+        res = find("entry")[-1]
+        self.assertEqual(type(res), Entry)
+        self.assertEqual(res.nick, "bart")
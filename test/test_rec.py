@@ -0,0 +1,65 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"record/replay"
+
+
+import os
+
+
+from run.hdl import Command, Event, Handler
+from run.obj import Wd
+from run.rec import Recorder, read, replay
+
+
+from wdr import Workdir
+
+
+class Quiet(Handler):
+
+    def raw(self, txt):
+        pass
+
+
+class TestRecord(Workdir):
+
+    def test_record(self):
+        path = Recorder.start(os.path.join(Wd.workdir, "record", "test.log"))
+        evt = Event()
+        evt.txt = "cmd"
+        evt.channel = "#test"
+        Command.handle(evt)
+        Recorder.stop()
+        line = list(read(path))[-1]
+        self.assertEqual(line[-2:], ["#test", "cmd"])
+
+    def test_otxt(self):
+        path = Recorder.start(os.path.join(Wd.workdir, "record", "otxt.log"))
+        evt = Event()
+        evt.txt = "cmd log txt==zzz -v"
+        Command.handle(evt)
+        Recorder.stop()
+        self.assertEqual(list(read(path))[-1][-1], "cmd log txt==zzz -v")
+        hdl = Quiet()
+        hdl.start()
+        events = replay(hdl, path, 0)
+        for evt in events:
+            evt.wait()
+        hdl.stop()
+        self.assertEqual(events[-1].gets.txt, "zzz")
+        self.assertEqual(events[-1].opts, "v")
+
+    def test_replay(self):
+        path = Recorder.start(os.path.join(Wd.workdir, "record", "replay.log"))
+        evt = Event()
+        evt.txt = "cmd"
+        Command.handle(evt)
+        Recorder.stop()
+        hdl = Quiet()
+        hdl.start()
+        events = replay(hdl, path, 0)
+        for evt in events:
+            evt.wait()
+        hdl.stop()
+        self.assertEqual(events[-1].txt, "cmd")
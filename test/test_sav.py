@@ -0,0 +1,61 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"save"
+
+
+import os
+import subprocess
+import sys
+
+
+from run.obj import Digest, Object, Wd, find, save
+
+
+from wdr import Workdir
+
+
+OTHER = """
+import sys
+from run.obj import Object, Wd, hook, save
+Wd.workdir = sys.argv[1]
+obj = hook(Wd.getpath(sys.argv[2]))
+obj.txt = "other"
+save(obj)
+"""
+
+
+class TestSave(Workdir):
+
+    def test_unchanged(self):
+        obj = Object()
+        obj.txt = "unchanged"
+        fnm = save(obj)
+        self.assertEqual(save(obj), fnm)
+        obj.txt = "changed"
+        self.assertNotEqual(save(obj), fnm)
+
+    def test_cas(self):
+        Digest.cas = True
+        try:
+            one = Object()
+            one.txt = "same"
+            two = Object()
+            two.txt = "same"
+            pone = Wd.getpath(save(one))
+            ptwo = Wd.getpath(save(two))
+            self.assertTrue(os.path.samefile(pone, ptwo))
+        finally:
+            Digest.cas = False
+
+    def test_interleaved(self):
+        obj = Object()
+        obj.txt = "mine"
+        fnm = save(obj)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        subprocess.run([sys.executable, "-c", OTHER, Wd.workdir, fnm], env=env, check=True)
+        self.assertEqual(find("object")[-1].txt, "other")
+        self.assertNotEqual(save(obj), fnm)
+        self.assertEqual(find("object")[-1].txt, "mine")
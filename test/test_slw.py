@@ -0,0 +1,83 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"slow queries"
+
+
+from run.hdl import Event
+from run.mre import Cursor
+from run.obj import Object, find, save, stream
+from run.slw import Slow, worst
+
+
+from wdr import Workdir
+
+
+class Slowed(Object):
+
+    pass
+
+
+class TestSlow(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        self.threshold = Slow.threshold
+        Slow.threshold = 0.000001
+
+    def tearDown(self):
+        Slow.threshold = self.threshold
+        Workdir.tearDown(self)
+
+    def test_find(self):
+        obj = Slowed()
+        obj.txt = "slow"
+        save(obj)
+        find("slowed", {"txt": "slow"})
+        res = list(Slow.read())
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0]["op"], "find")
+        self.assertEqual(res[0]["selector"], {"txt": "slow"})
+        self.assertEqual(res[0]["types"], ["test_slw.Slowed"])
+        self.assertEqual(res[0]["matches"], 1)
+        self.assertTrue(res[0]["files"] >= 1)
+        self.assertTrue(res[0]["bytes"] > 0)
+
+    def test_stream(self):
+        for nr in range(3):
+            obj = Slowed()
+            obj.txt = "stream %s" % nr
+            save(obj)
+        Cursor.size = 2
+        try:
+            evt = Event()
+            Cursor.page(evt, (x.txt for x in stream("slowed")), ("slowed", None))
+            evt = Event()
+            Cursor.next(evt)
+        finally:
+            Cursor.size = 0
+            Cursor.cursors.clear()
+            Cursor.last.clear()
+        self.assertEqual(evt.result, ["stream 2"])
+        res = [x for x in Slow.read() if x["op"] == "stream"]
+        self.assertEqual(len(res), 2)
+        self.assertEqual([x["matches"] for x in res], [2, 1])
+        self.assertTrue(res[0]["files"] >= 2)
+        self.assertTrue(res[0]["bytes"] > 0)
+
+    def test_off(self):
+        Slow.threshold = 0
+        find("slowed")
+        self.assertEqual(list(Slow.read()), [])
+
+    def test_worst(self):
+        recs = [
+                {"op": "find", "otp": "log", "selector": {}, "elapsed": 1.0, "files": 10},
+                {"op": "find", "otp": "log", "selector": {}, "elapsed": 3.0, "files": 20},
+                {"op": "fns", "otp": "todo", "selector": {}, "elapsed": 2.0, "files": 5}
+               ]
+        res = worst(recs)
+        self.assertEqual(res[0][0], ("find", "log", ""))
+        self.assertEqual(res[0][1], {"nr": 2, "max": 3.0, "total": 4.0, "files": 20})
+        self.assertEqual(res[1][0][0], "fns")
@@ -0,0 +1,56 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"time ranges"
+
+
+import os
+
+
+from run.obj import Class, Object, Wd, cdir, find, save, timerange, totime
+
+
+from wdr import Workdir
+
+
+class Timed(Object):
+
+    pass
+
+
+Class.add(Timed)
+
+
+def old(txt, day):
+    path = Wd.getpath(os.path.join("test_tme.Timed", txt, day, "12:00:00.000001"))
+    cdir(path)
+    with open(path, "w", encoding="utf-8") as ofile:
+        ofile.write('{"txt": "%s"}' % txt)
+
+
+class TestTime(Workdir):
+
+    def test_range(self):
+        old("old1", "2020-01-01")
+        old("old2", "2020-02-01")
+        obj = Timed()
+        obj.txt = "new"
+        save(obj)
+        res = find("timed", timed={"from": "2020-01-15", "to": "2020-02-01"})
+        self.assertEqual([x.txt for x in res], ["old2"])
+        res = find("timed", timed={"from": "2021-01-01"})
+        self.assertEqual([x.txt for x in res], ["new"])
+
+    def test_limit(self):
+        old("old3", "2020-03-01")
+        res = find("timed", limit=1)
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0].__fnm__, find("timed")[-1].__fnm__)
+
+    def test_timerange(self):
+        obj = Object()
+        setattr(obj, "from", "2020-01-01")
+        start, end = timerange(obj)
+        self.assertEqual(start, totime("2020-01-01"))
+        self.assertEqual(end, None)
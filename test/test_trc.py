@@ -0,0 +1,75 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"tracing"
+
+
+import json
+import os
+
+
+from run.hdl import Command, Event
+from run.obj import Object, find, save
+from run.trc import Trace
+
+
+from wdr import Workdir
+
+
+def trc(event):
+    obj = Object()
+    obj.txt = "traced"
+    save(obj)
+    find("object")
+
+
+def traces():
+    if not os.path.exists(Trace.path()):
+        return []
+    with open(Trace.path(), "r", encoding="utf-8") as ifile:
+        return [json.loads(x) for x in ifile]
+
+
+def run(txt):
+    evt = Event()
+    evt.txt = txt
+    Command.handle(evt)
+    return evt
+
+
+class TestTrace(Workdir):
+
+    def setUp(self):
+        Workdir.setUp(self)
+        Command.add(trc)
+
+    def tearDown(self):
+        Trace.stop()
+        Command.remove("trc")
+        if os.path.exists(Trace.path()):
+            os.remove(Trace.path())
+        Workdir.tearDown(self)
+
+    def test_spans(self):
+        Trace.start()
+        evt = run("trc")
+        res = traces()[-1]
+        self.assertEqual(res["trace"], evt._traceid)
+        names = [(x["name"], x["depth"]) for x in res["spans"]]
+        self.assertEqual(names[:3], [("queue", 0), ("parse", 0), ("command", 0)])
+        self.assertTrue(("save", 1) in names)
+        self.assertTrue(("find", 1) in names)
+
+    def test_sampling(self):
+        Trace.start(0.0, 60.0)
+        run("trc")
+        self.assertEqual(traces(), [])
+        Trace.start(0.0, 0.000001)
+        run("trc")
+        self.assertEqual(len(traces()), 1)
+
+    def test_disabled(self):
+        run("trc")
+        self.assertEqual(traces(), [])
+        self.assertTrue(Trace.span("find") is Trace.skip)
@@ -0,0 +1,28 @@
+# This file is placed in the Public Domain.
+# pylint: disable=C0115,C0116
+
+
+"workdir"
+
+
+import shutil
+import tempfile
+import unittest
+
+
+from run.obj import Cache, Digest, Wd
+
+
+class Workdir(unittest.TestCase):
+
+    "runs every test in a fresh Wd.workdir that gets removed afterwards."
+
+    def setUp(self):
+        self.workdir = Wd.workdir
+        Wd.workdir = tempfile.mkdtemp(prefix="runtest")
+        Cache.invalidate()
+        Digest.digests.clear()
+
+    def tearDown(self):
+        shutil.rmtree(Wd.workdir, ignore_errors=True)
+        Wd.workdir = self.workdir